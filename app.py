@@ -5,9 +5,16 @@ PDF フィールド抽出 Webアプリ
     streamlit run app.py
 """
 
+import asyncio
+import gc
+import hashlib
+import pickle
+import shutil
 import streamlit as st
+import pandas as pd
 import tempfile
 import os
+from dataclasses import asdict
 from pathlib import Path
 from datetime import datetime
 
@@ -19,6 +26,68 @@ from database import Database, Feedback
 from exporter import CSVExporter
 from code_master import CodeMaster
 
+# アップロードファイルのコピー・ハッシュ計算単位
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# 抽出結果エディタの表示列 {列名: 見出し}
+DRAFT_COLUMNS = {
+    "pdf_path": "ファイル",
+    "contractor_name": "契約者名",
+    "contractor_kana": "ふりがな",
+    "user_name": "利用者名",
+    "user_kana": "利用者ふりがな",
+    "postal_code": "郵便番号",
+    "address": "住所",
+    "phone": "電話番号",
+    "email": "メール",
+    "lawyer_code": "弁護士",
+    "lawyer_name": "弁護士事務所",
+    "provider_code": "プロバイダ",
+    "provider_name": "プロバイダ名",
+    "memo": "メモ",
+}
+DRAFT_READONLY_COLUMNS = ["pdf_path", "lawyer_code", "lawyer_name", "provider_code", "provider_name"]
+
+# フィードバック画面の表示ラベル
+FEEDBACK_CATEGORY_FMT = {
+    "ui": "UI/操作性",
+    "feature": "機能追加",
+    "bug": "不具合報告",
+    "performance": "処理速度",
+    "other": "その他",
+}
+FEEDBACK_CATEGORY_SHORT = {
+    "ui": "UI/操作性",
+    "feature": "機能追加",
+    "bug": "不具合",
+    "performance": "速度",
+    "other": "その他",
+}
+FEEDBACK_PRIORITY_FMT = {
+    "low": "低（あったらいいな）",
+    "medium": "中（改善希望）",
+    "high": "高（業務に支障）",
+}
+FEEDBACK_PRIORITY_SHORT = {
+    "low": "低",
+    "medium": "中",
+    "high": "高",
+}
+FEEDBACK_STATUS_FMT = {
+    "pending": "未対応",
+    "in_progress": "対応中",
+    "done": "完了",
+    "rejected": "却下",
+}
+FEEDBACK_STATUSES = list(FEEDBACK_STATUS_FMT)
+FEEDBACK_STATUS_FILTER_FMT = {"all": "すべて", **FEEDBACK_STATUS_FMT}
+FEEDBACK_STATUS_ICONS = {
+    "pending": "🟡",
+    "in_progress": "🔵",
+    "done": "🟢",
+    "rejected": "🔴",
+}
+
 # ページ設定
 st.set_page_config(
     page_title="PDF フィールド抽出",
@@ -27,40 +96,89 @@ st.set_page_config(
 )
 
 # セッション状態の初期化
-if "extracted_data" not in st.session_state:
-    st.session_state.extracted_data = []
-if "db" not in st.session_state:
+if "draft_ids" not in st.session_state:
+    st.session_state.draft_ids = []
+
+
+@st.cache_resource
+def get_db() -> Database:
+    """データベースを取得（プロセス内で共有）"""
     Config.setup_directories()
-    st.session_state.db = Database()
-if "code_master" not in st.session_state:
-    st.session_state.code_master = CodeMaster()
+    return Database()
+
+
+@st.cache_resource
+def get_code_master() -> CodeMaster:
+    """コードマスタを取得（プロセス内で共有）"""
+    return CodeMaster()
+
+
+@st.cache_resource
+def _freeze_startup_objects():
+    """
+    起動時に読み込んだモジュールや共有リソースをGCの走査対象から外す（プロセス内で一度だけ実行）
+
+    再実行のたびに長寿命のオブジェクトを走査しないようにし、自動GC自体は有効のままにする
+    """
+    get_db()
+    get_code_master()
+    gc.collect()
+    gc.freeze()
+
+
+@st.cache_resource
+def _create_services():
+    """サービスを生成（プロセス内で一度だけ実行）"""
+    return PDFConverter(), GoogleVisionOCR(), FieldExtractor(code_master=get_code_master())
+
+
+@st.cache_data(ttl=30)
+def _cached_customer_stats(_db: Database) -> dict:
+    """顧客統計（短時間キャッシュ）"""
+    return _db.get_customer_stats()
+
+
+@st.cache_data(ttl=30)
+def _cached_history_dataframe(_db: Database, query: str):
+    """履歴一覧（短時間キャッシュ）"""
+    return _db.history_dataframe(query or None)
+
+
+def clear_customer_cache():
+    """顧客データの書き込み後にキャッシュを破棄"""
+    _cached_customer_stats.clear()
+    _cached_history_dataframe.clear()
 
 
 def init_services():
     """サービスを初期化"""
     try:
-        converter = PDFConverter()
-        ocr = GoogleVisionOCR()
-        extractor = FieldExtractor()
+        converter, ocr, extractor = _create_services()
         return converter, ocr, extractor, None
     except Exception as e:
         return None, None, None, str(e)
 
 
-def process_pdf(pdf_file, converter, ocr, extractor) -> ExtractedFields:
-    """PDFを処理してフィールドを抽出"""
+def process_pdf(pdf_file, converter, ocr, extractor, thread_count: int = None) -> ExtractedFields:
+    """PDFを処理してフィールドを抽出（thread_count はPDF→画像変換の並列数）"""
     # 一時ファイルに保存
+    # バッファ全体を複製しないようチャンク単位でコピー
     with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(pdf_file.getvalue())
+        pdf_file.seek(0)
+        shutil.copyfileobj(pdf_file, tmp, length=COPY_CHUNK_SIZE)
         tmp_path = Path(tmp.name)
 
     try:
-        # PDF→画像変換
-        image_paths = converter.convert(tmp_path)
+        # テキストレイヤーがあればOCRを省略
+        ocr_text = converter.extract_text_layer(tmp_path)
+
+        if ocr_text is None:
+            # PDF→画像変換（ディスクを介さずメモリ上で受け渡す）
+            images = converter.convert_to_bytes(tmp_path, thread_count)
 
-        # OCR実行
-        ocr_results = ocr.ocr_document(image_paths, tmp_path)
-        ocr_text = ocr.get_combined_text(ocr_results)
+            # OCR実行
+            ocr_results = ocr.ocr_document(images, tmp_path)
+            ocr_text = ocr.get_combined_text(ocr_results)
 
         # フィールド抽出
         fields = extractor.extract(ocr_text, tmp_path)
@@ -71,7 +189,94 @@ def process_pdf(pdf_file, converter, ocr, extractor) -> ExtractedFields:
     finally:
         # 一時ファイル削除
         tmp_path.unlink(missing_ok=True)
-        converter.cleanup(tmp_path)
+
+
+def _cache_key(pdf_file, ocr, extractor) -> str:
+    """PDF内容・OCRモデル・抽出プロンプトからキャッシュキーを生成"""
+    prompt_hash = hashlib.sha256(extractor.EXTRACTION_PROMPT.encode("utf-8")).hexdigest()
+    version = f"{ocr.MODEL_VERSION}:{extractor.model}:{prompt_hash}"
+
+    h = hashlib.sha256()
+    pdf_file.seek(0)
+    while chunk := pdf_file.read(COPY_CHUNK_SIZE):
+        h.update(chunk)
+    h.update(version.encode("utf-8"))
+    return h.hexdigest()
+
+
+def process_pdf_cached(pdf_file, converter, ocr, extractor, thread_count: int = None) -> ExtractedFields:
+    """同一内容のPDFは前回の抽出結果を再利用して処理"""
+    key = _cache_key(pdf_file, ocr, extractor)
+    cache_path = Config.CACHE_DIR / f"{key}.pkl"
+
+    if cache_path.exists():
+        try:
+            with open(cache_path, "rb") as f:
+                fields = pickle.load(f)
+            fields.pdf_path = pdf_file.name
+            return fields
+        except (OSError, pickle.UnpicklingError, EOFError):
+            cache_path.unlink(missing_ok=True)
+
+    fields = process_pdf(pdf_file, converter, ocr, extractor, thread_count)
+
+    # 抽出に失敗した結果はキャッシュしない
+    if fields.confidence > 0:
+        Config.CACHE_DIR.mkdir(exist_ok=True)
+        tmp_cache_path = cache_path.with_suffix(".tmp")
+        with open(tmp_cache_path, "wb") as f:
+            pickle.dump(fields, f)
+        tmp_cache_path.replace(cache_path)
+
+    return fields
+
+
+async def process_pdf_async(
+    pdf_file, converter, ocr, extractor, sem: asyncio.Semaphore
+) -> ExtractedFields:
+    """PDFを非同期に処理（同時実行数はセマフォで制限）"""
+    # 同時に処理するPDFで変換スレッドを分け合い、合計がCPU数を超えないようにする
+    thread_count = max(1, converter.thread_count // Config.MAX_CONCURRENCY)
+    async with sem:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, process_pdf_cached, pdf_file, converter, ocr, extractor, thread_count
+        )
+
+
+async def process_pdfs_async(uploaded_files, converter, ocr, extractor, on_complete=None):
+    """
+    複数PDFを並列に処理
+
+    Args:
+        uploaded_files: アップロードされたPDFのリスト
+        converter, ocr, extractor: 各サービス
+        on_complete: 1件完了ごとに呼ばれるコールバック (完了数, pdf_file, fields, error)
+
+    Returns:
+        アップロード順に並べた ExtractedFields のリスト（失敗分は除外）
+    """
+    sem = asyncio.Semaphore(Config.MAX_CONCURRENCY)
+
+    async def run(index, pdf_file):
+        try:
+            fields = await process_pdf_async(pdf_file, converter, ocr, extractor, sem)
+            return index, pdf_file, fields, None
+        except Exception as e:
+            return index, pdf_file, None, e
+
+    tasks = [run(i, f) for i, f in enumerate(uploaded_files)]
+    results = {}
+
+    # 起動順ではなく完了順に進捗を通知
+    for done, future in enumerate(asyncio.as_completed(tasks), start=1):
+        index, pdf_file, fields, error = await future
+        if fields is not None:
+            results[index] = fields
+        if on_complete:
+            on_complete(done, pdf_file, fields, error)
+
+    return [results[i] for i in sorted(results)]
 
 
 def render_sidebar():
@@ -99,13 +304,13 @@ def render_sidebar():
 
         # 統計
         st.subheader("処理統計")
-        stats = st.session_state.db.get_customer_stats()
+        stats = _cached_customer_stats(get_db())
         st.metric("総顧客数", stats["total"])
 
         if stats["by_lawyer"]:
             st.write("弁護士別:")
             for code, count in list(stats["by_lawyer"].items())[:5]:
-                name = st.session_state.code_master.get_lawyer_name(code)
+                name = get_code_master().get_lawyer_name(code)
                 st.write(f"  {code}: {name} ({count}件)")
 
 
@@ -131,60 +336,67 @@ def render_upload_tab():
                 return
 
             progress = st.progress(0)
-            results = []
 
-            for i, pdf_file in enumerate(uploaded_files):
-                with st.spinner(f"処理中: {pdf_file.name}"):
-                    try:
-                        fields = process_pdf(pdf_file, converter, ocr, extractor)
-                        results.append(fields)
-                        st.success(f"完了: {pdf_file.name}")
-                    except Exception as e:
-                        st.error(f"エラー: {pdf_file.name} - {e}")
+            def on_complete(done, pdf_file, fields, error):
+                if error is None:
+                    st.success(f"完了: {pdf_file.name}")
+                else:
+                    st.error(f"エラー: {pdf_file.name} - {error}")
+                progress.progress(done / len(uploaded_files))
 
-                progress.progress((i + 1) / len(uploaded_files))
+            with st.spinner(f"処理中: {len(uploaded_files)} 件"):
+                results = asyncio.run(
+                    process_pdfs_async(uploaded_files, converter, ocr, extractor, on_complete)
+                )
 
-            st.session_state.extracted_data = results
+            # 抽出結果はDBの下書きに退避し、セッションにはIDのみ保持
+            st.session_state.draft_ids = [get_db().insert_draft(f) for f in results]
             st.success(f"{len(results)} 件の抽出が完了しました")
 
     # 抽出結果の表示
-    if st.session_state.extracted_data:
+    drafts = get_db().get_drafts(st.session_state.draft_ids)
+    if drafts:
         st.divider()
         st.subheader("抽出結果")
 
-        for i, fields in enumerate(st.session_state.extracted_data):
-            with st.expander(f"📄 {fields.pdf_path}", expanded=(i == 0)):
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    st.text_input("契約者名", value=fields.contractor_name, key=f"name_{i}")
-                    st.text_input("ふりがな", value=fields.contractor_kana, key=f"kana_{i}")
-                    st.text_input("利用者名", value=fields.user_name, key=f"user_{i}")
-                    st.text_input("利用者ふりがな", value=fields.user_kana, key=f"user_kana_{i}")
-                    st.text_input("郵便番号", value=fields.postal_code, key=f"zip_{i}")
-
-                with col2:
-                    st.text_input("住所", value=fields.address, key=f"addr_{i}")
-                    st.text_input("電話番号", value=fields.phone, key=f"phone_{i}")
-                    st.text_input("メール", value=fields.email, key=f"email_{i}")
-                    st.text_input("弁護士", value=f"{fields.lawyer_code}: {fields.lawyer_name}", key=f"lawyer_{i}", disabled=True)
-                    st.text_input("プロバイダ", value=f"{fields.provider_code}: {fields.provider_name}", key=f"provider_{i}", disabled=True)
-
-                st.text_area("メモ", value=fields.memo, key=f"memo_{i}")
+        # 全件を1つの表として編集（行ごとのウィジェットを作らない）
+        df = pd.DataFrame([asdict(d) for d in drafts])
+        edited = st.data_editor(
+            df,
+            column_order=list(DRAFT_COLUMNS),
+            column_config=DRAFT_COLUMNS,
+            disabled=DRAFT_READONLY_COLUMNS,
+            num_rows="fixed",
+            hide_index=True,
+            use_container_width=True,
+        )
 
         # 保存ボタン
         col1, col2 = st.columns(2)
         with col1:
             if st.button("データベースに保存", type="primary"):
-                for fields in st.session_state.extracted_data:
-                    st.session_state.db.insert_customer_from_fields(fields)
-                st.success("保存しました")
-                st.session_state.extracted_data = []
-                st.rerun()
+                # 空欄のセルがNaNのまま保存されないよう空文字に揃える
+                edited = edited.fillna("")
+                missing = edited[
+                    (edited["contractor_name"].str.strip() == "") | (edited["address"].str.strip() == "")
+                ]
+                if not missing.empty:
+                    files = "、".join(missing["pdf_path"].map(lambda p: Path(p).name))
+                    st.error(f"契約者名と住所は必須です: {files}")
+                else:
+                    get_db().insert_customers_from_fields(list(edited.itertuples(index=False)))
+                    clear_customer_cache()
+                    st.success("保存しました")
+                    get_db().delete_drafts(st.session_state.draft_ids)
+                    st.session_state.draft_ids = []
+                    gc.collect()
+                    st.rerun()
 
         with col2:
             if st.button("クリア"):
-                st.session_state.extracted_data = []
+                get_db().delete_drafts(st.session_state.draft_ids)
+                st.session_state.draft_ids = []
+                gc.collect()
                 st.rerun()
 
 
@@ -192,43 +404,27 @@ def render_history_tab():
     """履歴タブを描画"""
     st.header("処理履歴")
 
-    # 検索
-    search_query = st.text_input("検索（名前・住所）")
+    # 検索（送信時のみ再実行）
+    with st.form("search", clear_on_submit=False):
+        search_query = st.text_input("検索（名前・住所）")
+        st.form_submit_button("検索")
 
-    if search_query:
-        customers = st.session_state.db.search_customers(search_query)
-    else:
-        customers = st.session_state.db.get_all_customers()
+    df = _cached_history_dataframe(get_db(), search_query)
 
-    st.info(f"{len(customers)} 件")
+    st.info(f"{len(df)} 件")
 
-    if customers:
-        # テーブル表示用データ
-        data = []
-        for c in customers:
-            data.append({
-                "ID": c.id,
-                "契約者名": c.contractor_name,
-                "住所": c.address[:30] + "..." if len(c.address) > 30 else c.address,
-                "電話番号": c.phone,
-                "弁護士": c.lawyer_code,
-                "プロバイダ": c.provider_code,
-                "登録日": c.created_at.strftime("%Y-%m-%d %H:%M") if c.created_at else "",
-            })
-
-        st.dataframe(data, use_container_width=True)
+    if not df.empty:
+        st.dataframe(df, use_container_width=True, hide_index=True)
 
         # CSV出力
         if st.button("CSVダウンロード"):
             exporter = CSVExporter()
-            csv_path = exporter.export_customers(st.session_state.db)
-            with open(csv_path, "rb") as f:
-                st.download_button(
-                    "ダウンロード",
-                    f,
-                    file_name="customers.csv",
-                    mime="text/csv",
-                )
+            st.download_button(
+                "ダウンロード",
+                b"".join(exporter.iter_customers_csv(get_db())),
+                file_name="customers.csv",
+                mime="text/csv",
+            )
 
 
 def render_master_tab():
@@ -240,7 +436,7 @@ def render_master_tab():
     with tab1:
         st.subheader("弁護士マスタ")
 
-        lawyers = st.session_state.code_master.list_lawyers()
+        lawyers = get_code_master().list_lawyers()
         for code, name in lawyers.items():
             col1, col2, col3 = st.columns([1, 3, 1])
             with col1:
@@ -250,25 +446,27 @@ def render_master_tab():
 
         st.divider()
         st.subheader("追加")
-        col1, col2, col3 = st.columns([1, 2, 2])
-        with col1:
-            new_code = st.text_input("コード", max_chars=2, key="new_lawyer_code")
-        with col2:
-            new_name = st.text_input("事務所名", key="new_lawyer_name")
-        with col3:
-            new_aliases = st.text_input("別名（カンマ区切り）", key="new_lawyer_aliases")
-
-        if st.button("弁護士追加"):
-            if new_code and new_name:
-                aliases = [a.strip() for a in new_aliases.split(",")] if new_aliases else []
-                st.session_state.code_master.add_lawyer(new_code.upper(), new_name, aliases)
-                st.success(f"追加しました: {new_code}")
-                st.rerun()
+        # フォームにまとめて送信時のみ再実行する
+        with st.form("lawyer_add", clear_on_submit=True):
+            col1, col2, col3 = st.columns([1, 2, 2])
+            with col1:
+                new_code = st.text_input("コード", max_chars=2, key="new_lawyer_code")
+            with col2:
+                new_name = st.text_input("事務所名", key="new_lawyer_name")
+            with col3:
+                new_aliases = st.text_input("別名（カンマ区切り）", key="new_lawyer_aliases")
+
+            if st.form_submit_button("弁護士追加"):
+                if new_code and new_name:
+                    aliases = [a.strip() for a in new_aliases.split(",")] if new_aliases else []
+                    get_code_master().add_lawyer(new_code.upper(), new_name, aliases)
+                    st.success(f"追加しました: {new_code}")
+                    st.rerun()
 
     with tab2:
         st.subheader("プロバイダマスタ")
 
-        providers = st.session_state.code_master.list_providers()
+        providers = get_code_master().list_providers()
         for code, name in providers.items():
             col1, col2 = st.columns([1, 3])
             with col1:
@@ -278,20 +476,21 @@ def render_master_tab():
 
         st.divider()
         st.subheader("追加")
-        col1, col2, col3 = st.columns([1, 2, 2])
-        with col1:
-            new_code = st.text_input("コード", max_chars=2, key="new_provider_code")
-        with col2:
-            new_name = st.text_input("プロバイダ名", key="new_provider_name")
-        with col3:
-            new_aliases = st.text_input("別名（カンマ区切り）", key="new_provider_aliases")
-
-        if st.button("プロバイダ追加"):
-            if new_code and new_name:
-                aliases = [a.strip() for a in new_aliases.split(",")] if new_aliases else []
-                st.session_state.code_master.add_provider(new_code.upper(), new_name, aliases)
-                st.success(f"追加しました: {new_code}")
-                st.rerun()
+        with st.form("provider_add", clear_on_submit=True):
+            col1, col2, col3 = st.columns([1, 2, 2])
+            with col1:
+                new_code = st.text_input("コード", max_chars=2, key="new_provider_code")
+            with col2:
+                new_name = st.text_input("プロバイダ名", key="new_provider_name")
+            with col3:
+                new_aliases = st.text_input("別名（カンマ区切り）", key="new_provider_aliases")
+
+            if st.form_submit_button("プロバイダ追加"):
+                if new_code and new_name:
+                    aliases = [a.strip() for a in new_aliases.split(",")] if new_aliases else []
+                    get_code_master().add_provider(new_code.upper(), new_name, aliases)
+                    st.success(f"追加しました: {new_code}")
+                    st.rerun()
 
 
 def render_feedback_tab():
@@ -307,25 +506,15 @@ def render_feedback_tab():
         with st.form("feedback_form"):
             category = st.selectbox(
                 "カテゴリ",
-                options=["ui", "feature", "bug", "performance", "other"],
-                format_func=lambda x: {
-                    "ui": "UI/操作性",
-                    "feature": "機能追加",
-                    "bug": "不具合報告",
-                    "performance": "処理速度",
-                    "other": "その他",
-                }[x],
+                options=list(FEEDBACK_CATEGORY_FMT),
+                format_func=FEEDBACK_CATEGORY_FMT.get,
             )
 
             priority = st.selectbox(
                 "優先度",
-                options=["low", "medium", "high"],
+                options=list(FEEDBACK_PRIORITY_FMT),
                 index=1,
-                format_func=lambda x: {
-                    "low": "低（あったらいいな）",
-                    "medium": "中（改善希望）",
-                    "high": "高（業務に支障）",
-                }[x],
+                format_func=FEEDBACK_PRIORITY_FMT.get,
             )
 
             content = st.text_area(
@@ -340,7 +529,7 @@ def render_feedback_tab():
 
             if submitted:
                 if content.strip():
-                    st.session_state.db.insert_feedback(
+                    get_db().insert_feedback(
                         category=category,
                         content=content,
                         priority=priority,
@@ -355,7 +544,7 @@ def render_feedback_tab():
         st.subheader("過去の提案")
 
         # 統計表示
-        stats = st.session_state.db.get_feedback_stats()
+        stats = get_db().get_feedback_stats()
         if stats["total"] > 0:
             cols = st.columns(4)
             with cols[0]:
@@ -373,101 +562,84 @@ def render_feedback_tab():
         # フィルタ
         filter_status = st.selectbox(
             "ステータスで絞り込み",
-            options=["all", "pending", "in_progress", "done", "rejected"],
-            format_func=lambda x: {
-                "all": "すべて",
-                "pending": "未対応",
-                "in_progress": "対応中",
-                "done": "完了",
-                "rejected": "却下",
-            }[x],
+            options=list(FEEDBACK_STATUS_FILTER_FMT),
+            format_func=FEEDBACK_STATUS_FILTER_FMT.get,
         )
 
         # フィードバック一覧
         if filter_status == "all":
-            feedbacks = st.session_state.db.get_all_feedbacks(limit=50)
+            feedbacks = get_db().get_all_feedbacks(limit=50)
         else:
-            feedbacks = st.session_state.db.get_feedbacks_by_status(filter_status)
+            feedbacks = get_db().get_feedbacks_by_status(filter_status)
 
         if feedbacks:
-            for fb in feedbacks:
-                status_colors = {
-                    "pending": "🟡",
-                    "in_progress": "🔵",
-                    "done": "🟢",
-                    "rejected": "🔴",
-                }
-                category_labels = {
-                    "ui": "UI/操作性",
-                    "feature": "機能追加",
-                    "bug": "不具合",
-                    "performance": "速度",
-                    "other": "その他",
-                }
-                priority_labels = {
-                    "low": "低",
-                    "medium": "中",
-                    "high": "高",
+            # 一覧は1つの表で表示し、編集用ウィジェットは選択した1件分のみ描画する
+            df = pd.DataFrame(
+                {
+                    "ID": fb.id,
+                    "状態": FEEDBACK_STATUS_ICONS.get(fb.status, "⚪"),
+                    "カテゴリ": FEEDBACK_CATEGORY_SHORT.get(fb.category, fb.category),
+                    "優先度": FEEDBACK_PRIORITY_SHORT.get(fb.priority, fb.priority),
+                    "内容": fb.content,
+                    "投稿者": fb.user_name or "匿名",
+                    "登録日": fb.created_at.strftime("%Y/%m/%d %H:%M") if fb.created_at else "-",
                 }
+                for fb in feedbacks
+            )
+            st.dataframe(df, use_container_width=True, hide_index=True)
 
-                with st.expander(
-                    f"{status_colors.get(fb.status, '⚪')} [{category_labels.get(fb.category, fb.category)}] {fb.content[:40]}..."
-                    if len(fb.content) > 40
-                    else f"{status_colors.get(fb.status, '⚪')} [{category_labels.get(fb.category, fb.category)}] {fb.content}"
-                ):
-                    st.write(f"**内容:** {fb.content}")
-                    st.write(f"**優先度:** {priority_labels.get(fb.priority, fb.priority)}")
-                    st.write(f"**投稿者:** {fb.user_name or '匿名'}")
-                    st.write(f"**登録日:** {fb.created_at.strftime('%Y/%m/%d %H:%M') if fb.created_at else '-'}")
-
-                    # ステータス変更（管理用）
-                    new_status = st.selectbox(
-                        "ステータス変更",
-                        options=["pending", "in_progress", "done", "rejected"],
-                        index=["pending", "in_progress", "done", "rejected"].index(fb.status),
-                        format_func=lambda x: {
-                            "pending": "未対応",
-                            "in_progress": "対応中",
-                            "done": "完了",
-                            "rejected": "却下",
-                        }[x],
-                        key=f"status_{fb.id}",
-                    )
+            feedback_by_id = {fb.id: fb for fb in feedbacks}
+            selected_id = st.selectbox(
+                "編集対象",
+                options=list(feedback_by_id),
+                format_func=lambda x: f"#{x} {feedback_by_id[x].content[:40]}",
+            )
+            fb = feedback_by_id[selected_id]
+
+            # ステータス変更（管理用）
+            new_status = st.selectbox(
+                "ステータス変更",
+                options=FEEDBACK_STATUSES,
+                index=FEEDBACK_STATUSES.index(fb.status),
+                format_func=FEEDBACK_STATUS_FMT.get,
+                key=f"status_{fb.id}",
+            )
 
-                    col_a, col_b = st.columns(2)
-                    with col_a:
-                        if st.button("更新", key=f"update_{fb.id}"):
-                            st.session_state.db.update_feedback_status(fb.id, new_status)
-                            st.success("更新しました")
-                            st.rerun()
-                    with col_b:
-                        if st.button("削除", key=f"delete_{fb.id}"):
-                            st.session_state.db.delete_feedback(fb.id)
-                            st.success("削除しました")
-                            st.rerun()
+            col_a, col_b = st.columns(2)
+            with col_a:
+                if st.button("更新", key="update_feedback"):
+                    get_db().update_feedback_status(fb.id, new_status)
+                    st.success("更新しました")
+                    st.rerun()
+            with col_b:
+                if st.button("削除", key="delete_feedback"):
+                    get_db().delete_feedback(fb.id)
+                    st.success("削除しました")
+                    gc.collect()
+                    st.rerun()
         else:
             st.info("フィードバックはまだありません")
 
 
-def main():
-    st.title("📄 PDF フィールド抽出システム")
+PAGES = {
+    "アップロード": render_upload_tab,
+    "履歴": render_history_tab,
+    "マスタ管理": render_master_tab,
+    "💬 フィードバック": render_feedback_tab,
+}
 
-    render_sidebar()
 
-    # メインタブ
-    tab1, tab2, tab3, tab4 = st.tabs(["アップロード", "履歴", "マスタ管理", "💬 フィードバック"])
+def main():
+    _freeze_startup_objects()
 
-    with tab1:
-        render_upload_tab()
+    st.title("📄 PDF フィールド抽出システム")
 
-    with tab2:
-        render_history_tab()
+    # 選択中の画面のみ描画する（st.tabs は全タブを毎回実行してしまう）
+    active = st.sidebar.radio("画面", list(PAGES))
 
-    with tab3:
-        render_master_tab()
+    render_sidebar()
 
-    with tab4:
-        render_feedback_tab()
+    PAGES[active]()
 
 
 if __name__ == "__main__":
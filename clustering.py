@@ -1,17 +1,48 @@
 """ベクトル化 & クラスタリングモジュール"""
 
+import hashlib
+import re
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import TYPE_CHECKING, List, Dict, Tuple
 from dataclasses import dataclass
 
 import numpy as np
-from sklearn.cluster import DBSCAN, KMeans
-from sklearn.preprocessing import StandardScaler
-from sentence_transformers import SentenceTransformer
+from datasketch import MinHash, MinHashLSH
+from model2vec import StaticModel
+from sklearn.cluster import DBSCAN, KMeans, MiniBatchKMeans
 
 from config import Config
+from dbscan_numba import dbscan_precomputed
 from feature_extractor import DocumentFeatures
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+# 空白以外の文字（見つかった時点で走査を打ち切る）
+_NON_SPACE = re.compile(r"\S")
+
+
+@lru_cache(maxsize=2)
+def _get_embedding_model(model_name: str, device: str) -> "SentenceTransformer":
+    """埋め込みモデルをロード（プロセス内で共有）"""
+    # torch / sentence-transformers は高精度モード専用の任意依存のため使用時に読み込む
+    from sentence_transformers import SentenceTransformer
+
+    print("埋め込みモデルをロード中...")
+    model = SentenceTransformer(model_name, device=device)
+    model.eval()
+    return model
+
+
+@lru_cache(maxsize=2)
+def _get_static_model(model_name: str) -> StaticModel:
+    """model2vec の静的埋め込みモデルをロード（プロセス内で共有）"""
+    print("埋め込みモデルをロード中...")
+    return StaticModel.from_pretrained(model_name)
+
 
 @dataclass
 class ClusterResult:
@@ -19,33 +50,163 @@ class ClusterResult:
 
     pdf_path: Path
     cluster_id: int
-    combined_vector: np.ndarray
+    row_idx: int  # DocumentClusterer.vectors の行番号
 
 
 class DocumentClusterer:
     """文書クラスタリングクラス"""
 
-    def __init__(self):
+    def __init__(self, embedding_backend: str = None):
+        """
+        Args:
+            embedding_backend: "model2vec" or "sentence_transformers"（デフォルト: Config.EMBEDDING_BACKEND）
+        """
+        self.embedding_backend = embedding_backend or Config.EMBEDDING_BACKEND
+        if self.embedding_backend not in ("model2vec", "sentence_transformers"):
+            raise ValueError(f"未対応の埋め込み方式: {self.embedding_backend}")
         self.embedding_model = None  # 遅延ロード
-        self.scaler = StandardScaler()
+        # 直近の process() で結合した特徴量 (n_docs, dim)、float16
+        self.vectors: np.ndarray = None
+        # ほぼ同一テキストの検出用（高精度モデル使用時のみ）
+        self._fp_index = MinHashLSH(
+            threshold=Config.NEAR_DUPLICATE_JACCARD, num_perm=Config.MINHASH_NUM_PERM
+        )
+        self._fp_minhashes: Dict[str, MinHash] = {}
+        self._fp_vectors: Dict[str, np.ndarray] = {}
 
     def _load_embedding_model(self):
         """埋め込みモデルを遅延ロード"""
         if self.embedding_model is None:
-            print("埋め込みモデルをロード中...")
-            self.embedding_model = SentenceTransformer(Config.EMBEDDING_MODEL)
+            if self.embedding_backend == "model2vec":
+                self.embedding_model = _get_static_model(Config.FAST_EMBEDDING_MODEL)
+                return
+
+            import torch
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.embedding_model = _get_embedding_model(Config.EMBEDDING_MODEL, device)
+            # 長いOCRテキストのパディングを抑える
+            self.embedding_model.max_seq_length = Config.EMBEDDING_MAX_SEQ_LENGTH
+
+    def _embedding_cache_key(self, text: str) -> str:
+        """モデル名・エンコード設定・テキストから埋め込みキャッシュのキーを生成"""
+        if self.embedding_backend == "model2vec":
+            settings = f"model2vec\x00{Config.FAST_EMBEDDING_MODEL}\x00normalized"
+        else:
+            settings = f"{Config.EMBEDDING_MODEL}\x00{Config.EMBEDDING_MAX_SEQ_LENGTH}\x00normalized"
+        return hashlib.sha256((settings + "\x00" + text).encode("utf-8")).hexdigest()
 
     def compute_text_embeddings(self, texts: List[str]) -> np.ndarray:
-        """テキストを埋め込みベクトルに変換"""
-        self._load_embedding_model()
+        """
+        テキストを埋め込みベクトルに変換
 
+        計算済みのベクトルはディスクにキャッシュし、未計算のテキストのみエンコードする
+        """
         # 空テキストの処理
-        processed_texts = [t if t.strip() else "空のドキュメント" for t in texts]
-        embeddings = self.embedding_model.encode(
-            processed_texts, show_progress_bar=True
-        )
+        processed_texts = [t if _NON_SPACE.search(t) else "空のドキュメント" for t in texts]
+        keys = [self._embedding_cache_key(t) for t in processed_texts]
+
+        cache_dir = Config.CACHE_DIR / "embeddings"
+        vectors: Dict[str, np.ndarray] = {}
+        miss_texts: Dict[str, str] = {}  # 同一テキストは1回だけエンコード
+
+        for key, text in zip(keys, processed_texts):
+            if key in vectors or key in miss_texts:
+                continue
+            cache_path = cache_dir / f"{key}.npy"
+            if cache_path.exists():
+                try:
+                    vectors[key] = np.load(cache_path)
+                    continue
+                except (OSError, ValueError, EOFError):
+                    # 書き込み途中で中断された等の壊れたキャッシュは削除して再計算
+                    cache_path.unlink(missing_ok=True)
+            miss_texts[key] = text
+
+        # 高精度モデルは推論が重いため、ほぼ同一のテキストは既存のベクトルで代用
+        near_duplicates: Dict[str, str] = {}
+        if miss_texts and self.embedding_backend == "sentence_transformers":
+            near_duplicates = self._find_near_duplicates(miss_texts)
+            for key in near_duplicates:
+                del miss_texts[key]
+
+        if miss_texts:
+            self._load_embedding_model()
+            embeddings = self._encode(list(miss_texts.values()))
+
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            for key, vec in zip(miss_texts, embeddings):
+                # 中断されても壊れたファイルが残らないよう一時ファイルに書いてから置き換える
+                cache_path = cache_dir / f"{key}.npy"
+                tmp_cache_path = cache_path.with_suffix(".tmp")
+                with open(tmp_cache_path, "wb") as f:
+                    np.save(f, vec)
+                tmp_cache_path.replace(cache_path)
+                vectors[key] = vec
+                if key in self._fp_minhashes:
+                    self._fp_vectors[key] = vec
+
+        # 代用したベクトルは近似のためディスクには保存しない
+        for key, source_key in near_duplicates.items():
+            vectors[key] = self._fp_vectors[source_key]
+
+        return np.stack([vectors[key] for key in keys])
+
+    def _minhash(self, text: str) -> MinHash:
+        """文字シングルのMinHashを計算"""
+        size = Config.MINHASH_SHINGLE_SIZE
+        shingles = {text[i:i + size] for i in range(max(len(text) - size + 1, 1))}
+        minhash = MinHash(num_perm=Config.MINHASH_NUM_PERM)
+        minhash.update_batch([s.encode("utf-8") for s in shingles])
+        return minhash
+
+    def _find_near_duplicates(self, miss_texts: Dict[str, str]) -> Dict[str, str]:
+        """
+        エンコード対象のテキストから、既出テキストとほぼ同一のものを探す
+
+        既出でないテキストは以降の照合用に登録する
 
-        return np.array(embeddings)
+        Returns:
+            {キー: 代用元のキー} の辞書
+        """
+        near_duplicates = {}
+        for key, text in miss_texts.items():
+            if key in self._fp_minhashes:
+                continue
+            minhash = self._minhash(text)
+            for candidate in self._fp_index.query(minhash):
+                # 前回のエンコードが失敗してベクトルが無い候補は使わない
+                if candidate not in self._fp_vectors and candidate not in miss_texts:
+                    continue
+                if self._fp_minhashes[candidate].jaccard(minhash) >= Config.NEAR_DUPLICATE_JACCARD:
+                    near_duplicates[key] = candidate
+                    break
+            else:
+                self._fp_index.insert(key, minhash)
+                self._fp_minhashes[key] = minhash
+        return near_duplicates
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """ロード済みのモデルでテキストを正規化済みベクトルにエンコード"""
+        if self.embedding_backend == "model2vec":
+            # トークン埋め込みの平均のみで計算できるためTransformerの推論が不要
+            embeddings = np.asarray(self.embedding_model.encode(texts), dtype=np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            return embeddings / norms
+
+        import torch
+
+        on_gpu = self.embedding_model.device.type == "cuda"
+        # テンソルのまま受け取り、最後に一度だけnumpyへ変換
+        with torch.inference_mode():
+            return self.embedding_model.encode(
+                texts,
+                batch_size=Config.EMBEDDING_BATCH_SIZE_GPU if on_gpu else Config.EMBEDDING_BATCH_SIZE_CPU,
+                show_progress_bar=True,
+                convert_to_tensor=True,
+                normalize_embeddings=True,
+            ).cpu().numpy()
 
     def combine_features(
         self,
@@ -69,20 +230,36 @@ class DocumentClusterer:
         text_weight = text_weight or Config.TEXT_WEIGHT
         layout_weight = layout_weight or Config.LAYOUT_WEIGHT
 
-        # レイアウト特徴量を配列に変換
-        layout_array = np.array(layout_features)
+        # float32の配列に変換
+        text_array = np.asarray(text_embeddings, dtype=np.float32)
+        layout_array = np.asarray(layout_features, dtype=np.float32)
+        d_text = text_array.shape[1]
 
-        # 正規化
-        text_normalized = self.scaler.fit_transform(text_embeddings)
-        layout_normalized = self.scaler.fit_transform(layout_array)
+        # レイアウト特徴量が無い・全て0の場合は結合しても距離が変わらないため省略
+        if layout_array.size == 0 or not layout_array.any():
+            combined = np.empty_like(text_array)
+            self._standardize_into(text_array, combined, text_weight)
+            return combined
 
-        # 重み付け結合
-        combined = np.hstack(
-            [text_normalized * text_weight, layout_normalized * layout_weight]
+        # 正規化・重み付けした結果を結合先のバッファへ直接書き込む
+        combined = np.empty(
+            (len(text_array), d_text + layout_array.shape[1]), dtype=np.float32
         )
+        self._standardize_into(text_array, combined[:, :d_text], text_weight)
+        self._standardize_into(layout_array, combined[:, d_text:], layout_weight)
 
         return combined
 
+    @staticmethod
+    def _standardize_into(x: np.ndarray, out: np.ndarray, weight: float) -> None:
+        """列ごとに標準化して重みを掛け、outに書き込む（StandardScalerと同じ定義）"""
+        mean = x.mean(axis=0)
+        std = x.std(axis=0)
+        std[std == 0] = 1.0  # 分散0の列はそのまま
+
+        np.subtract(x, mean, out=out)
+        out *= weight / std
+
     def cluster(
         self,
         features: np.ndarray,
@@ -103,6 +280,17 @@ class DocumentClusterer:
         method = method or Config.CLUSTERING_METHOD
 
         if method == "dbscan":
+            # コサイン距離は向きのみに依存するため、ここで一度だけ単位ベクトル化
+            features = self._normalize_rows(features)
+            if len(features) <= Config.DBSCAN_PRECOMPUTED_MAX_DOCS:
+                # コサイン距離行列を行列積1回で求め、JIT版DBSCANで展開
+                return dbscan_precomputed(
+                    self._cosine_distance_matrix(features),
+                    eps=Config.DBSCAN_EPS,
+                    min_samples=Config.DBSCAN_MIN_SAMPLES,
+                )
+
+            # 文書数が多い場合は距離行列がメモリに載らないため逐次計算
             clusterer = DBSCAN(
                 eps=Config.DBSCAN_EPS,
                 min_samples=Config.DBSCAN_MIN_SAMPLES,
@@ -112,13 +300,34 @@ class DocumentClusterer:
             n_clusters = n_clusters or Config.KMEANS_N_CLUSTERS
             # データ数がクラスタ数より少ない場合は調整
             n_clusters = min(n_clusters, len(features))
-            clusterer = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+            if len(features) > Config.MINIBATCH_KMEANS_MIN_DOCS:
+                # 大量の文書では全件でのLloyd反復を避け、ミニバッチで更新
+                clusterer = MiniBatchKMeans(
+                    n_clusters=n_clusters, batch_size=1024, n_init=3, random_state=42
+                )
+            else:
+                clusterer = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
         else:
             raise ValueError(f"未対応のクラスタリング手法: {method}")
 
         labels = clusterer.fit_predict(features)
         return labels
 
+    @staticmethod
+    def _normalize_rows(features: np.ndarray) -> np.ndarray:
+        """各行をL2ノルム1に正規化（ゼロベクトルはそのまま）"""
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return features / norms
+
+    @staticmethod
+    def _cosine_distance_matrix(normalized: np.ndarray) -> np.ndarray:
+        """単位ベクトル化済みの特徴量からコサイン距離行列 (1 - 内積) を計算"""
+        distances = normalized @ normalized.T
+        np.subtract(1.0, distances, out=distances)
+        np.clip(distances, 0.0, 2.0, out=distances)
+        return distances
+
     def process(
         self,
         doc_features: List[DocumentFeatures],
@@ -152,14 +361,17 @@ class DocumentClusterer:
         # クラスタリング
         labels = self.cluster(combined, method, n_clusters)
 
+        # 保持用のベクトルは半精度で十分（距離計算はfloat32で実施済み）
+        self.vectors = combined.astype(np.float16)
+
         # 結果をまとめる
         results = []
-        for df, label, vector in zip(doc_features, labels, combined):
+        for row_idx, (df, label) in enumerate(zip(doc_features, labels)):
             results.append(
                 ClusterResult(
                     pdf_path=df.pdf_path,
                     cluster_id=int(label),
-                    combined_vector=vector,
+                    row_idx=row_idx,
                 )
             )
 
@@ -175,12 +387,10 @@ class DocumentClusterer:
         Returns:
             {cluster_id: [pdf_paths]} の辞書
         """
-        summary = {}
+        summary = defaultdict(list)
         for r in results:
-            if r.cluster_id not in summary:
-                summary[r.cluster_id] = []
             summary[r.cluster_id].append(r.pdf_path)
-        return summary
+        return dict(summary)
 
     def print_cluster_summary(self, results: List[ClusterResult]):
         """クラスタリング結果のサマリーを表示"""
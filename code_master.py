@@ -9,6 +9,8 @@ import logging
 from pathlib import Path
 from typing import Optional
 
+import ahocorasick
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +28,12 @@ class CodeMaster:
         self.master_file = master_file
         self.lawyers: dict = {}
         self.providers: dict = {}
+        # {コード: 名称} の対応表（読み込み・追加時に更新）
+        self._lawyer_names: dict = {}
+        self._provider_names: dict = {}
+        # 名称・エイリアス検索用のAho-Corasickオートマトン
+        self._lawyer_ac = None
+        self._provider_ac = None
         self._load_master()
 
     def _load_master(self) -> None:
@@ -35,12 +43,56 @@ class CodeMaster:
                 data = json.load(f)
             self.lawyers = data.get('lawyers', {})
             self.providers = data.get('providers', {})
+            self._build_name_maps()
+            self._build_automata()
             logger.info(f"コードマスタを読み込みました: 弁護士{len(self.lawyers)}件, プロバイダ{len(self.providers)}件")
         except FileNotFoundError:
             logger.warning(f"マスタファイルが見つかりません: {self.master_file}")
         except json.JSONDecodeError as e:
             logger.error(f"マスタファイルの解析に失敗: {e}")
 
+    def _build_name_maps(self) -> None:
+        """コード→名称の対応表を構築"""
+        self._lawyer_names = {code: info['name'] for code, info in self.lawyers.items()}
+        self._provider_names = {code: info['name'] for code, info in self.providers.items()}
+
+    def _build_automata(self) -> None:
+        """名称・エイリアス検索用のオートマトンを構築"""
+        self._lawyer_ac = self._build_automaton(self.lawyers)
+        self._provider_ac = self._build_automaton(self.providers)
+
+    @staticmethod
+    def _build_automaton(entries: dict) -> Optional[ahocorasick.Automaton]:
+        """
+        正式名称・エイリアス（小文字化）→(マスタ内の順序, コード) のオートマトンを構築
+
+        同じ語が複数のコードに登録されている場合はマスタ内で先のコードを優先する
+        """
+        automaton = ahocorasick.Automaton()
+        for order, (code, info) in enumerate(entries.items()):
+            if code == "XX":
+                continue
+            for word in [info['name'], *info.get('aliases', [])]:
+                key = word.lower()
+                if key and key not in automaton:
+                    automaton.add_word(key, (order, code))
+
+        if len(automaton) == 0:
+            return None
+        automaton.make_automaton()
+        return automaton
+
+    @staticmethod
+    def _find_code(automaton: Optional[ahocorasick.Automaton], text: str) -> str:
+        """テキストを1回走査し、マッチしたうちマスタ内で最も先のコードを返す"""
+        if not text or automaton is None:
+            return "XX"
+
+        matches = [value for _, value in automaton.iter(text.lower())]
+        if not matches:
+            return "XX"
+        return min(matches)[1]
+
     def find_lawyer_code(self, text: str) -> str:
         """
         テキストから弁護士コードを検索
@@ -51,23 +103,7 @@ class CodeMaster:
         Returns:
             2文字の弁護士コード（見つからない場合は"XX"）
         """
-        if not text:
-            return "XX"
-
-        text_lower = text.lower()
-
-        for code, info in self.lawyers.items():
-            if code == "XX":
-                continue
-            # 正式名称でマッチ
-            if info['name'] in text:
-                return code
-            # エイリアスでマッチ
-            for alias in info.get('aliases', []):
-                if alias.lower() in text_lower:
-                    return code
-
-        return "XX"
+        return self._find_code(self._lawyer_ac, text)
 
     def find_provider_code(self, text: str) -> str:
         """
@@ -79,31 +115,15 @@ class CodeMaster:
         Returns:
             2文字のプロバイダコード（見つからない場合は"XX"）
         """
-        if not text:
-            return "XX"
-
-        text_lower = text.lower()
-
-        for code, info in self.providers.items():
-            if code == "XX":
-                continue
-            # 正式名称でマッチ
-            if info['name'].lower() in text_lower:
-                return code
-            # エイリアスでマッチ
-            for alias in info.get('aliases', []):
-                if alias.lower() in text_lower:
-                    return code
-
-        return "XX"
+        return self._find_code(self._provider_ac, text)
 
     def get_lawyer_name(self, code: str) -> str:
         """コードから弁護士事務所名を取得"""
-        return self.lawyers.get(code, {}).get('name', '不明')
+        return self._lawyer_names.get(code, '不明')
 
     def get_provider_name(self, code: str) -> str:
         """コードからプロバイダ名を取得"""
-        return self.providers.get(code, {}).get('name', '不明')
+        return self._provider_names.get(code, '不明')
 
     def add_lawyer(self, code: str, name: str, aliases: list[str] = None) -> None:
         """弁護士コードを追加"""
@@ -111,6 +131,8 @@ class CodeMaster:
             'name': name,
             'aliases': aliases or []
         }
+        self._lawyer_names[code] = name
+        self._lawyer_ac = self._build_automaton(self.lawyers)
         self._save_master()
 
     def add_provider(self, code: str, name: str, aliases: list[str] = None) -> None:
@@ -119,6 +141,8 @@ class CodeMaster:
             'name': name,
             'aliases': aliases or []
         }
+        self._provider_names[code] = name
+        self._provider_ac = self._build_automaton(self.providers)
         self._save_master()
 
     def _save_master(self) -> None:
@@ -133,8 +157,8 @@ class CodeMaster:
 
     def list_lawyers(self) -> dict:
         """全弁護士コードを取得"""
-        return {code: info['name'] for code, info in self.lawyers.items()}
+        return self._lawyer_names
 
     def list_providers(self) -> dict:
         """全プロバイダコードを取得"""
-        return {code: info['name'] for code, info in self.providers.items()}
+        return self._provider_names
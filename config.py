@@ -15,11 +15,15 @@ class Config:
     INPUT_DIR = BASE_DIR / "input"
     OUTPUT_DIR = BASE_DIR / "output"
     TEMP_DIR = BASE_DIR / "temp"
+    CACHE_DIR = BASE_DIR / "cache"  # 抽出結果キャッシュ
     DB_PATH = OUTPUT_DIR / "documents.db"
 
     # PDF→画像変換設定
     DPI = 300
-    IMAGE_FORMAT = "PNG"
+    IMAGE_FORMAT = "JPEG"  # PNGより小さくVision APIへの送信量も減る
+    JPEG_QUALITY = 85
+    CONVERT_THREADS = os.cpu_count() or 1  # pdftoppmの並列数
+    TEXT_LAYER_MIN_CHARS = 200  # 1ページあたりこの文字数以上ならOCRを省略
 
     # Tesseract設定（簡易OCR用）
     TESSERACT_LANG = "jpn"  # 日本語
@@ -32,10 +36,22 @@ class Config:
     CLUSTERING_METHOD = "dbscan"  # "dbscan" or "kmeans"
     DBSCAN_EPS = 0.5  # DBSCANの距離閾値
     DBSCAN_MIN_SAMPLES = 2  # DBSCANの最小サンプル数
+    DBSCAN_PRECOMPUTED_MAX_DOCS = 8000  # この件数までは距離行列を事前計算
     KMEANS_N_CLUSTERS = 10  # k-meansのクラスタ数（オプション指定時）
+    MINIBATCH_KMEANS_MIN_DOCS = 5000  # この件数を超えるとMiniBatchKMeansを使用
+
+    # テキスト埋め込み
+    EMBEDDING_BACKEND = "model2vec"  # "model2vec"（高速） or "sentence_transformers"（高精度）
+    FAST_EMBEDDING_MODEL = "minishlab/potion-multilingual-128M"  # model2vec 静的埋め込み
 
     # sentence-transformers モデル
     EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+    EMBEDDING_MAX_SEQ_LENGTH = 256  # トークン数の上限
+    EMBEDDING_BATCH_SIZE_GPU = 1024
+    EMBEDDING_BATCH_SIZE_CPU = 64
+    NEAR_DUPLICATE_JACCARD = 0.9  # この類似度以上のテキストは既存の埋め込みを再利用
+    MINHASH_NUM_PERM = 128
+    MINHASH_SHINGLE_SIZE = 5  # 文字単位のシングル長
 
     # 特徴量の重み（テキスト vs レイアウト）
     TEXT_WEIGHT = 0.7
@@ -44,12 +60,16 @@ class Config:
     # CSV出力設定
     CSV_ENCODING = "utf-8-sig"  # BOM付きUTF-8（Excel対応）
 
+    # Webアプリ設定
+    MAX_CONCURRENCY = 8  # PDFの同時処理数
+
     @classmethod
     def setup_directories(cls):
         """必要なディレクトリを作成"""
         cls.INPUT_DIR.mkdir(exist_ok=True)
         cls.OUTPUT_DIR.mkdir(exist_ok=True)
         cls.TEMP_DIR.mkdir(exist_ok=True)
+        cls.CACHE_DIR.mkdir(exist_ok=True)
 
     @classmethod
     def validate(cls):
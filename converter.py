@@ -1,26 +1,74 @@
 """PDF→画像変換モジュール"""
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 import shutil
+import subprocess
+import threading
 
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
+import numpy as np
 from PIL import Image
+import pypdfium2 as pdfium
 
 from config import Config
 
+# PDFiumは別文書どうしでもスレッドセーフではないため、プロセス内の呼び出しを直列化する
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _render_pages_to_shared_memory(pdf_path: Path, last_page: Optional[int]) -> List[tuple]:
+    """
+    PDFの各ページを描画して共有メモリに書き込む（ワーカープロセス用）
+
+    Returns:
+        ページ順の (共有メモリ名, shape, dtype) のリスト
+    """
+    handles = []
+    doc = pdfium.PdfDocument(str(pdf_path))
+    try:
+        page_count = len(doc) if last_page is None else min(last_page, len(doc))
+        for page_index in range(page_count):
+            page = doc[page_index]
+            array = page.render(scale=Config.DPI / 72).to_numpy()
+            page.close()
+
+            shm = SharedMemory(create=True, size=array.nbytes)
+            handles.append((shm, array.shape, array.dtype.str))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    except Exception:
+        # 途中で失敗した場合は作成済みの共有メモリを解放
+        for shm, _, _ in handles:
+            shm.close()
+            shm.unlink()
+        raise
+    finally:
+        doc.close()
+
+    # 解放は受け取った親プロセスが行う
+    for shm, _, _ in handles:
+        shm.close()
+    return [(shm.name, shape, dtype) for shm, shape, dtype in handles]
+
 
 class PDFConverter:
     """PDFを画像に変換するクラス"""
 
-    def __init__(self, temp_dir: Path = None):
+    def __init__(self, temp_dir: Path = None, thread_count: int = None):
         self.temp_dir = temp_dir or Config.TEMP_DIR
         self.temp_dir.mkdir(exist_ok=True)
+        self.thread_count = thread_count or Config.CONVERT_THREADS
 
     def convert(self, pdf_path: Path) -> List[Path]:
         """
         PDFを画像に変換
 
+        画像ファイルが不要な場合は convert_to_bytes / convert_to_array を使用すること
+
         Args:
             pdf_path: PDFファイルのパス
 
@@ -35,21 +83,78 @@ class PDFConverter:
         doc_temp_dir = self.temp_dir / pdf_path.stem
         doc_temp_dir.mkdir(exist_ok=True)
 
-        # PDF→画像変換
-        images = convert_from_path(
-            pdf_path,
-            dpi=Config.DPI,
-            fmt=Config.IMAGE_FORMAT.lower(),
-        )
+        # pdftoppm がページを分担して直接ファイルに書き出す
+        return self._render(pdf_path, doc_temp_dir, "page", thread_count=self.thread_count)
+
+    def convert_to_bytes(self, pdf_path: Path, thread_count: int = None) -> List[bytes]:
+        """
+        PDFを画像データに変換（一時ファイルを介さない）
+
+        Args:
+            pdf_path: PDFファイルのパス
+            thread_count: ページ変換の並列数（省略時は self.thread_count）
+
+        Returns:
+            ページ順のエンコード済み画像データのリスト
+        """
+        pdf_path = Path(pdf_path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDFが見つかりません: {pdf_path}")
+
+        page_count = pdfinfo_from_path(str(pdf_path))["Pages"]
+        with ThreadPoolExecutor(max_workers=thread_count or self.thread_count) as pool:
+            return list(
+                pool.map(
+                    lambda page: self._render_page_bytes(pdf_path, page),
+                    range(1, page_count + 1),
+                )
+            )
+
+    def _render_page_bytes(self, pdf_path: Path, page: int) -> bytes:
+        """pdftoppm で1ページを標準出力に書き出して取得"""
+        args = ["pdftoppm", "-r", str(Config.DPI), "-f", str(page), "-l", str(page), "-singlefile"]
+        if Config.IMAGE_FORMAT.lower() in ("jpeg", "jpg"):
+            args += ["-jpeg", "-jpegopt", f"quality={Config.JPEG_QUALITY}"]
+        else:
+            args += ["-png"]
+        args.append(str(pdf_path))
+
+        result = subprocess.run(args, capture_output=True, check=True)
+        return result.stdout
+
+    def extract_text_layer(self, pdf_path: Path) -> Optional[str]:
+        """
+        PDFに埋め込まれたテキストレイヤーを取得（OCR不要な場合の高速経路）
+
+        Args:
+            pdf_path: PDFファイルのパス
+
+        Returns:
+            ページ区切り付きのテキスト。テキスト量が不足する場合はNone
+        """
+        with _PDFIUM_LOCK:
+            try:
+                doc = pdfium.PdfDocument(str(pdf_path))
+            except pdfium.PdfiumError:
+                return None
 
-        # 画像を保存
-        image_paths = []
-        for i, image in enumerate(images):
-            image_path = doc_temp_dir / f"page_{i + 1:03d}.{Config.IMAGE_FORMAT.lower()}"
-            image.save(image_path, Config.IMAGE_FORMAT)
-            image_paths.append(image_path)
+            try:
+                texts = []
+                for page in doc:
+                    textpage = page.get_textpage()
+                    texts.append(textpage.get_text_range().strip())
+                    textpage.close()
+                    page.close()
+            finally:
+                doc.close()
+
+        # スキャンPDF等でテキストがほぼ無い場合はOCRに回す
+        if not texts or sum(len(t) for t in texts) < Config.TEXT_LAYER_MIN_CHARS * len(texts):
+            return None
 
-        return image_paths
+        return "\n\n".join(
+            f"--- ページ {i + 1} ---\n{text}" for i, text in enumerate(texts) if text
+        )
 
     def convert_batch(self, pdf_paths: List[Path]) -> dict:
         """
@@ -62,18 +167,96 @@ class PDFConverter:
             {pdf_path: [image_paths]} の辞書
         """
         results = {}
-        for pdf_path in pdf_paths:
+        # PDF単位で並列化するため、各PDF内のpdftoppmは1スレッドに抑える
+        worker = PDFConverter(self.temp_dir, thread_count=1)
+        with ProcessPoolExecutor(max_workers=self.thread_count) as pool:
+            futures = {pool.submit(worker.convert, pdf_path): pdf_path for pdf_path in pdf_paths}
+            for future in as_completed(futures):
+                pdf_path = futures[future]
+                try:
+                    results[pdf_path] = future.result()
+                except Exception as e:
+                    print(f"変換エラー [{pdf_path}]: {e}")
+                    results[pdf_path] = []
+        # 入力順に並べ直す
+        return {pdf_path: results[pdf_path] for pdf_path in pdf_paths}
+
+    def iter_arrays_batch(
+        self, pdf_paths: List[Path], last_page: Optional[int] = None
+    ) -> Iterator[Tuple[Path, List[np.ndarray]]]:
+        """
+        複数のPDFをワーカープロセスで並列に描画し、画像配列を入力順に返す
+
+        画素データは共有メモリ経由で受け取るため、ファイル書き出しやパイプでの転送は発生しない。
+        返した配列は次の要素を取り出す時点で解放されるため、保持する場合はコピーすること
+
+        Args:
+            pdf_paths: PDFファイルのパスリスト
+            last_page: 描画する最終ページ（1始まり、Noneで全ページ）
+
+        Yields:
+            (pdf_path, BGR形式のページ画像配列のリスト)
+        """
+        # 未消費の画素データが共有メモリに溜まりすぎないよう先行投入数を制限
+        max_pending = self.thread_count * 2
+        # ワーカーが親と同じリソーストラッカーを使うよう先に起動しておく
+        # （ワーカー終了時に未消費の共有メモリが削除されるのを防ぐ）
+        resource_tracker.ensure_running()
+        with ProcessPoolExecutor(max_workers=self.thread_count) as pool:
+            pending = deque()
+            remaining = iter(pdf_paths)
+            for pdf_path in remaining:
+                pending.append((pdf_path, pool.submit(_render_pages_to_shared_memory, pdf_path, last_page)))
+                if len(pending) >= max_pending:
+                    break
+
             try:
-                results[pdf_path] = self.convert(pdf_path)
-            except Exception as e:
-                print(f"変換エラー [{pdf_path}]: {e}")
-                results[pdf_path] = []
-        return results
+                while pending:
+                    pdf_path, future = pending.popleft()
+                    next_path = next(remaining, None)
+                    if next_path is not None:
+                        pending.append((next_path, pool.submit(_render_pages_to_shared_memory, next_path, last_page)))
+
+                    try:
+                        handles = future.result()
+                    except Exception as e:
+                        print(f"変換エラー [{pdf_path}]: {e}")
+                        continue
+
+                    segments = [SharedMemory(name=name) for name, _, _ in handles]
+                    pages = [
+                        np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+                        for shm, (_, shape, dtype) in zip(segments, handles)
+                    ]
+                    try:
+                        yield pdf_path, pages
+                    finally:
+                        pages.clear()
+                        self._release_shared_memory(segments)
+            finally:
+                # 途中で打ち切られた場合は未消費の結果を破棄
+                for _, future in pending:
+                    if future.cancel():
+                        continue
+                    try:
+                        handles = future.result()
+                    except Exception:
+                        continue
+                    self._release_shared_memory([SharedMemory(name=name) for name, _, _ in handles])
+
+    @staticmethod
+    def _release_shared_memory(segments: List[SharedMemory]) -> None:
+        """共有メモリを閉じて削除"""
+        for shm in segments:
+            shm.close()
+            shm.unlink()
 
     def get_first_page_image(self, pdf_path: Path) -> Path:
         """
         PDFの1ページ目のみを画像化（クラスタリング用）
 
+        ファイルが不要な場合は convert_to_array を使用すること
+
         Args:
             pdf_path: PDFファイルのパス
 
@@ -84,18 +267,85 @@ class PDFConverter:
         doc_temp_dir = self.temp_dir / pdf_path.stem
         doc_temp_dir.mkdir(exist_ok=True)
 
-        images = convert_from_path(
+        # 1ページだけなら pdftoppm を起動せずプロセス内で描画する
+        image = self._render_page_pil(pdf_path, 0)
+        if Config.IMAGE_FORMAT.lower() in ("jpeg", "jpg"):
+            image_path = doc_temp_dir / "first.jpg"
+            image.save(image_path, "JPEG", quality=Config.JPEG_QUALITY)
+        else:
+            image_path = doc_temp_dir / "first.png"
+            image.save(image_path, "PNG")
+        return image_path
+
+    def convert_to_array(self, pdf_path: Path, page_index: int = 0) -> np.ndarray:
+        """
+        PDFの指定ページを画像配列として取得（画像ファイルのエンコード・書き出しなし）
+
+        Args:
+            pdf_path: PDFファイルのパス
+            page_index: ページ番号（0始まり）
+
+        Returns:
+            BGR形式の画像配列 (height, width, 3)
+        """
+        pdf_path = Path(pdf_path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDFが見つかりません: {pdf_path}")
+
+        with _PDFIUM_LOCK:
+            doc = pdfium.PdfDocument(str(pdf_path))
+            try:
+                page = doc[page_index]
+                # pdfium の既定出力はBGRのためOpenCVでそのまま扱える
+                array = page.render(scale=Config.DPI / 72).to_numpy().copy()
+                page.close()
+            finally:
+                doc.close()
+        return array
+
+    def _render_page_pil(self, pdf_path: Path, page_index: int) -> Image.Image:
+        """pdfium で指定ページをプロセス内で描画してPIL画像を返す"""
+        with _PDFIUM_LOCK:
+            doc = pdfium.PdfDocument(str(pdf_path))
+            try:
+                page = doc[page_index]
+                # to_pil はビットマップのバッファを共有し得るため、複製してからロック内で閉じる
+                bitmap = page.render(scale=Config.DPI / 72)
+                image = bitmap.to_pil().copy()
+                bitmap.close()
+                page.close()
+            finally:
+                doc.close()
+        return image
+
+    def _render(self, pdf_path: Path, output_dir: Path, prefix: str, **kwargs) -> List[Path]:
+        """
+        pdftoppm で画像ファイルを直接出力する（PILでの再エンコードなし）
+
+        Args:
+            pdf_path: PDFファイルのパス
+            output_dir: 出力ディレクトリ
+            prefix: 出力ファイル名の接頭辞
+            **kwargs: convert_from_path への追加引数
+
+        Returns:
+            ページ順の画像パスリスト
+        """
+        # 前回の出力が混ざらないよう削除
+        for old in output_dir.glob(f"{prefix}*"):
+            old.unlink()
+
+        paths = convert_from_path(
             pdf_path,
             dpi=Config.DPI,
             fmt=Config.IMAGE_FORMAT.lower(),
-            first_page=1,
-            last_page=1,
+            jpegopt={"quality": Config.JPEG_QUALITY},
+            output_folder=output_dir,
+            output_file=prefix,
+            paths_only=True,
+            **kwargs,
         )
-
-        image_path = doc_temp_dir / f"page_001.{Config.IMAGE_FORMAT.lower()}"
-        images[0].save(image_path, Config.IMAGE_FORMAT)
-
-        return image_path
+        return [Path(p) for p in paths]
 
     def cleanup(self, pdf_path: Path = None):
         """
@@ -1,15 +1,52 @@
 """SQLite データベースモジュール"""
 
+import queue
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, fields
 from datetime import datetime
+from functools import lru_cache, wraps
+from itertools import groupby, islice
+
+import pandas as pd
 
 from config import Config
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value: str) -> datetime:
+    """ISO形式の日時文字列を変換（同一時刻の行が多いためキャッシュする）"""
+    return datetime.fromisoformat(value)
+
+
+_LIKE_SPECIAL = re.compile(r"([\\%_])")
+
+
+def _like_contains(query: str) -> str:
+    """部分一致のLIKEパターンを生成（% _ \\ はエスケープし ESCAPE '\\' で照合する）"""
+    return "%" + _LIKE_SPECIAL.sub(r"\\\1", query) + "%"
+
+
+def _like_prefix(query: str) -> str:
+    """前方一致のLIKEパターンを生成（索引の範囲検索に変換できる）"""
+    return _LIKE_SPECIAL.sub(r"\\\1", query) + "%"
+
+
+def _fts_phrase(query: str) -> str:
+    """FTS5のMATCHに渡す語句（検索語全体を1つのフレーズとして照合する）"""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _to_datetime(value: Optional[str]) -> Optional[datetime]:
+    """DBの日時カラムの値をdatetimeに変換（空ならNone）"""
+    return _parse_timestamp(value) if value else None
+
+
+@dataclass(slots=True)
 class Customer:
     """顧客レコード"""
 
@@ -29,32 +66,43 @@ class Customer:
     provider_code: str          # プロバイダコード
     provider_name: str          # プロバイダ名
     confidence: float           # 抽出信頼度
-    created_at: datetime
+    created_at: Optional[datetime] = None
 
     @classmethod
     def from_row(cls, row: tuple) -> "Customer":
-        return cls(
-            id=row[0],
-            document_id=row[1],
-            contractor_name=row[2],
-            contractor_kana=row[3],
-            user_name=row[4],
-            user_kana=row[5],
-            postal_code=row[6],
-            address=row[7],
-            phone=row[8],
-            email=row[9],
-            memo=row[10],
-            lawyer_code=row[11],
-            lawyer_name=row[12],
-            provider_code=row[13],
-            provider_name=row[14],
-            confidence=row[15],
-            created_at=datetime.fromisoformat(row[16]) if row[16] else None,
-        )
+        # 列順はフィールド順と一致（末尾が created_at）
+        return cls(*row[:-1], _to_datetime(row[-1]))
+
+
+@dataclass(slots=True)
+class Draft:
+    """保存前の抽出結果レコード（ExtractedFieldsと同じ属性を持つ）"""
+
+    id: Optional[int]
+    contractor_name: str
+    contractor_kana: str
+    user_name: str
+    user_kana: str
+    postal_code: str
+    address: str
+    phone: str
+    email: str
+    memo: str
+    lawyer_code: str
+    lawyer_name: str
+    provider_code: str
+    provider_name: str
+    pdf_path: str
+    confidence: float
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Draft":
+        # 列順はフィールド順と一致（末尾が created_at）
+        return cls(*row[:-1], _to_datetime(row[-1]))
 
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """文書レコード"""
 
@@ -65,23 +113,15 @@ class Document:
     ocr_text: str
     page_count: int
     confidence: float
-    created_at: datetime
+    created_at: Optional[datetime] = None
 
     @classmethod
     def from_row(cls, row: tuple) -> "Document":
-        return cls(
-            id=row[0],
-            filename=row[1],
-            filepath=row[2],
-            cluster_id=row[3],
-            ocr_text=row[4],
-            page_count=row[5],
-            confidence=row[6],
-            created_at=datetime.fromisoformat(row[7]) if row[7] else None,
-        )
+        # 列順はフィールド順と一致（末尾が created_at）
+        return cls(*row[:-1], _to_datetime(row[-1]))
 
 
-@dataclass
+@dataclass(slots=True)
 class Feedback:
     """フィードバックレコード"""
 
@@ -91,24 +131,16 @@ class Feedback:
     content: str            # フィードバック内容
     status: str             # pending, in_progress, done, rejected
     user_name: str          # 投稿者名（任意）
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     @classmethod
     def from_row(cls, row: tuple) -> "Feedback":
-        return cls(
-            id=row[0],
-            category=row[1],
-            priority=row[2],
-            content=row[3],
-            status=row[4],
-            user_name=row[5],
-            created_at=datetime.fromisoformat(row[6]) if row[6] else None,
-            updated_at=datetime.fromisoformat(row[7]) if row[7] else None,
-        )
+        # 列順はフィールド順と一致（末尾が created_at, updated_at）
+        return cls(*row[:-2], _to_datetime(row[-2]), _to_datetime(row[-1]))
 
 
-@dataclass
+@dataclass(slots=True)
 class Disclosure:
     """プロバイダ開示文書レコード"""
 
@@ -120,24 +152,15 @@ class Disclosure:
     court_case_number: str          # 裁判所事件番号
     requester_name: str             # 請求者（著作権者）
     requester_lawyer: str           # 請求者代理人
-    created_at: datetime
+    created_at: Optional[datetime] = None
 
     @classmethod
     def from_row(cls, row: tuple) -> "Disclosure":
-        return cls(
-            id=row[0],
-            document_id=row[1],
-            document_number=row[2],
-            provider_name=row[3],
-            disclosure_date=row[4],
-            court_case_number=row[5],
-            requester_name=row[6],
-            requester_lawyer=row[7],
-            created_at=datetime.fromisoformat(row[8]) if row[8] else None,
-        )
+        # 列順はフィールド順と一致（末尾が created_at）
+        return cls(*row[:-1], _to_datetime(row[-1]))
 
 
-@dataclass
+@dataclass(slots=True)
 class DisclosedSubscriber:
     """開示された契約者情報レコード"""
 
@@ -153,28 +176,15 @@ class DisclosedSubscriber:
     ip_address: str                 # IPアドレス
     port_number: int                # ポート番号
     communication_datetime: str     # 通信日時
-    created_at: datetime
+    created_at: Optional[datetime] = None
 
     @classmethod
     def from_row(cls, row: tuple) -> "DisclosedSubscriber":
-        return cls(
-            id=row[0],
-            disclosure_id=row[1],
-            sequence_number=row[2],
-            catalog_number=row[3],
-            subscriber_name=row[4],
-            subscriber_address=row[5],
-            subscriber_postal_code=row[6],
-            subscriber_phone=row[7],
-            subscriber_email=row[8],
-            ip_address=row[9],
-            port_number=row[10],
-            communication_datetime=row[11],
-            created_at=datetime.fromisoformat(row[12]) if row[12] else None,
-        )
+        # 列順はフィールド順と一致（末尾が created_at）
+        return cls(*row[:-1], _to_datetime(row[-1]))
 
 
-@dataclass
+@dataclass(slots=True)
 class AcceptanceNotice:
     """受任通知レコード"""
 
@@ -215,54 +225,168 @@ class AcceptanceNotice:
     work_title: str                 # 著作物名
     work_hash: str                  # ハッシュ値
 
-    created_at: datetime
+    created_at: Optional[datetime] = None
 
     @classmethod
     def from_row(cls, row: tuple) -> "AcceptanceNotice":
-        return cls(
-            id=row[0],
-            document_id=row[1],
-            notice_date=row[2],
-            court_case_number=row[3],
-            subscriber_name=row[4],
-            subscriber_address=row[5],
-            subscriber_postal_code=row[6],
-            user_name=row[7],
-            user_address=row[8],
-            user_postal_code=row[9],
-            user_phone=row[10],
-            user_email=row[11],
-            is_same_as_subscriber=bool(row[12]),
-            plaintiff_name=row[13],
-            plaintiff_lawyer_firm=row[14],
-            plaintiff_lawyer_name=row[15],
-            lawyer_firm=row[16],
-            lawyer_name=row[17],
-            lawyer_address=row[18],
-            lawyer_phone=row[19],
-            lawyer_fax=row[20],
-            lawyer_email=row[21],
-            infringement_ip=row[22],
-            infringement_datetime=row[23],
-            work_title=row[24],
-            work_hash=row[25],
-            created_at=datetime.fromisoformat(row[26]) if row[26] else None,
-        )
+        # 列順はフィールド順と一致（is_same_as_subscriber は bool、末尾の created_at は datetime に変換）
+        return cls(*row[:12], bool(row[12]), *row[13:-1], _to_datetime(row[-1]))
+
+
+@dataclass(slots=True)
+class DocumentMeta:
+    """OCRテキストを除いた文書レコード（一覧表示用）"""
+
+    id: Optional[int]
+    filename: str
+    filepath: str
+    cluster_id: int
+    page_count: int
+    confidence: float
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "DocumentMeta":
+        # 列順はフィールド順と一致（末尾が created_at）
+        return cls(*row[:-1], _to_datetime(row[-1]))
+
+
+@dataclass(slots=True)
+class AcceptanceNoticeMeta:
+    """一覧表示用に主要項目のみを持つ受任通知レコード"""
+
+    id: Optional[int]
+    court_case_number: str
+    plaintiff_name: str
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "AcceptanceNoticeMeta":
+        # 列順はフィールド順と一致（末尾が created_at）
+        return cls(*row[:-1], _to_datetime(row[-1]))
+
+
+def _columns_of(record_cls, alias: str = "") -> str:
+    """dataclassのフィールド順に並べたSELECT用の列リスト（aliasを指定すると列名に付ける）"""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(prefix + f.name for f in fields(record_cls))
+
+
+# SELECT * はテーブル定義の列順に依存するため、取得列はフィールドから組み立てる
+_CUSTOMER_COLUMNS = _columns_of(Customer)
+_DRAFT_COLUMNS = _columns_of(Draft)
+_DOCUMENT_COLUMNS = _columns_of(Document)
+_DOCUMENT_META_COLUMNS = _columns_of(DocumentMeta)
+_FEEDBACK_COLUMNS = _columns_of(Feedback)
+_DISCLOSURE_COLUMNS = _columns_of(Disclosure)
+_DISCLOSED_SUBSCRIBER_COLUMNS = _columns_of(DisclosedSubscriber)
+_ACCEPTANCE_NOTICE_COLUMNS = _columns_of(AcceptanceNotice)
+_ACCEPTANCE_NOTICE_META_COLUMNS = _columns_of(AcceptanceNoticeMeta)
+
+
+def _memoize_until_write(method):
+    """
+    統計メソッドの結果を、DBに書き込みがあるまで使い回す
+
+    画面の再描画ごとに同じ集計を繰り返さないためのもの
+    """
+
+    @wraps(method)
+    def wrapper(self):
+        # 集計前に世代を取るため、集計中に書き込まれた場合は次回に再集計される
+        generation = self._data_generation()
+        cached = self._stats_cache.get(method.__name__)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        result = method(self)
+        self._stats_cache[method.__name__] = (generation, result)
+        return result
+
+    return wrapper
 
 
 class Database:
     """SQLiteデータベース操作クラス"""
 
+    # 読み取り専用接続の本数（WALでは書き込み中も並行して読める）
+    _READ_POOL_SIZE = 4
+    _READ_POOL_TIMEOUT = 1.0  # 秒
+
+    # 日時を保存する列（テーブル名, 列名）
+    _TIMESTAMP_COLUMNS = (
+        ("documents", "created_at"),
+        ("clusters", "created_at"),
+        ("customers", "created_at"),
+        ("drafts", "created_at"),
+        ("feedbacks", "created_at"),
+        ("feedbacks", "updated_at"),
+        ("disclosures", "created_at"),
+        ("disclosed_subscribers", "created_at"),
+        ("acceptance_notices", "created_at"),
+    )
+
     def __init__(self, db_path: Path = None):
         self.db_path = db_path or Config.DB_PATH
         self.db_path.parent.mkdir(exist_ok=True)
+        # 書き込み用の接続は1本を使い回し、スレッド間はロックで直列化する
+        self._lock = threading.RLock()
+        self._in_write_txn = False  # write_txn の実行中か（ロックを持つスレッドのみが参照する）
+        self._write_gen = 0  # このプロセスから書き込んだ回数（統計キャッシュの無効化に使う）
+        self._stats_cache: dict = {}
+        self._conn = self._connect()
         self._init_db()
+        # 読み取りは専用接続のプールから取り、書き込みのロックを待たない
+        self._read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(self._READ_POOL_SIZE):
+            self._read_pool.put(self._connect(readonly=True))
+        # 統計キャッシュの世代確認専用の読み取り接続（書き込みロックを待たずに確認できる）
+        self._version_conn = self._connect(readonly=True)
+        self._version_lock = threading.Lock()
+
+    def _connect(self, readonly: bool = False) -> sqlite3.Connection:
+        """接続を開いて接続単位のPRAGMAを設定（WALモードはDBファイルに永続化されるため_init_dbで設定）"""
+        if readonly:
+            database, uri = f"{self.db_path.resolve().as_uri()}?mode=ro", True
+        else:
+            database, uri = self.db_path, False
+        # 各メソッドのSQLは同一文字列のため、文キャッシュを広げて解析済みの文を使い回す
+        conn = sqlite3.connect(
+            database, uri=uri, check_same_thread=False, cached_statements=256
+        )
+        # WALモードではNORMALでも破損せず、コミット毎のfsyncを省ける
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")  # ソート・一時テーブルをメモリ上に
+        conn.execute("PRAGMA cache_size=-65536")  # ページキャッシュ64MB
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MBまでmmapで読み込み
+        return conn
+
+    def close(self):
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+        with self._version_lock:
+            self._version_conn.close()
+        while not self._read_pool.empty():
+            self._read_pool.get_nowait().close()
 
     def _init_db(self):
         """データベースを初期化"""
         with self._get_connection() as conn:
+            # WALはDBファイルに永続化されるため初期化時に一度だけ設定
+            conn.execute("PRAGMA journal_mode=WAL")
+            existing = {
+                row[0]
+                for row in conn.execute(
+                    """
+                    SELECT name FROM sqlite_master
+                    WHERE name IN ('customers_fts', 'documents_fts', 'disclosed_subscribers_fts',
+                                   'acceptance_notices_fts', 'documents_cluster_count_insert')
+                    """
+                )
+            }
             conn.executescript(
                 """
+                -- 日時はdatetime.fromisoformatでそのまま読めるT区切りのISO形式（UTC）で保存
                 CREATE TABLE IF NOT EXISTS documents (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     filename TEXT NOT NULL,
@@ -271,7 +395,7 @@ class Database:
                     ocr_text TEXT,
                     page_count INTEGER DEFAULT 1,
                     confidence REAL DEFAULT 0,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now'))
                 );
 
                 CREATE TABLE IF NOT EXISTS clusters (
@@ -279,15 +403,64 @@ class Database:
                     name TEXT,
                     description TEXT,
                     document_count INTEGER DEFAULT 0,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now'))
                 );
 
-                CREATE INDEX IF NOT EXISTS idx_documents_cluster
-                ON documents(cluster_id);
+                -- クラスタ集計（件数・平均信頼度・ページ数）を本体に触れずに索引のみで行う
+                -- （rowidは全索引に含まれるため、cluster_id のみの索引は不要）
+                DROP INDEX IF EXISTS idx_documents_cluster;
+                CREATE INDEX IF NOT EXISTS idx_documents_cluster_cover
+                ON documents(cluster_id, confidence, page_count);
 
                 CREATE INDEX IF NOT EXISTS idx_documents_filename
                 ON documents(filename);
 
+                -- クラスタの文書数を文書の追加・削除・移動に合わせて増減
+                CREATE TRIGGER IF NOT EXISTS documents_cluster_count_insert AFTER INSERT ON documents
+                BEGIN
+                    INSERT INTO clusters (id, name, document_count)
+                    VALUES (new.cluster_id, 'クラスタ ' || new.cluster_id, 1)
+                    ON CONFLICT(id) DO UPDATE SET document_count = document_count + 1;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS documents_cluster_count_delete AFTER DELETE ON documents
+                BEGIN
+                    UPDATE clusters SET document_count = document_count - 1 WHERE id = old.cluster_id;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS documents_cluster_count_update
+                AFTER UPDATE OF cluster_id ON documents
+                WHEN old.cluster_id IS NOT new.cluster_id
+                BEGIN
+                    UPDATE clusters SET document_count = document_count - 1 WHERE id = old.cluster_id;
+                    INSERT INTO clusters (id, name, document_count)
+                    VALUES (new.cluster_id, 'クラスタ ' || new.cluster_id, 1)
+                    ON CONFLICT(id) DO UPDATE SET document_count = document_count + 1;
+                END;
+
+                -- OCRテキスト検索用の全文検索インデックス
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                    ocr_text, content='documents', content_rowid='id', tokenize='trigram'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents
+                BEGIN
+                    INSERT INTO documents_fts(rowid, ocr_text) VALUES (new.id, new.ocr_text);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents
+                BEGIN
+                    INSERT INTO documents_fts(documents_fts, rowid, ocr_text)
+                    VALUES ('delete', old.id, old.ocr_text);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE ON documents
+                BEGIN
+                    INSERT INTO documents_fts(documents_fts, rowid, ocr_text)
+                    VALUES ('delete', old.id, old.ocr_text);
+                    INSERT INTO documents_fts(rowid, ocr_text) VALUES (new.id, new.ocr_text);
+                END;
+
                 CREATE TABLE IF NOT EXISTS customers (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     document_id INTEGER,
@@ -305,19 +478,68 @@ class Database:
                     provider_code TEXT DEFAULT 'XX',
                     provider_name TEXT,
                     confidence REAL DEFAULT 0,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now')),
                     FOREIGN KEY (document_id) REFERENCES documents(id)
                 );
 
-                CREATE INDEX IF NOT EXISTS idx_customers_lawyer
-                ON customers(lawyer_code);
+                -- コード別一覧の並び順（登録日の新しい順）まで索引で満たす
+                DROP INDEX IF EXISTS idx_customers_lawyer;
+                CREATE INDEX IF NOT EXISTS idx_customers_lawyer_created
+                ON customers(lawyer_code, created_at DESC);
 
-                CREATE INDEX IF NOT EXISTS idx_customers_provider
-                ON customers(provider_code);
+                DROP INDEX IF EXISTS idx_customers_provider;
+                CREATE INDEX IF NOT EXISTS idx_customers_provider_created
+                ON customers(provider_code, created_at DESC);
 
                 CREATE INDEX IF NOT EXISTS idx_customers_contractor
                 ON customers(contractor_name);
 
+                -- 顧客検索用の全文検索インデックス（日本語のためtrigramで部分一致）
+                CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+                    contractor_name, contractor_kana, user_name, address,
+                    content='customers', content_rowid='id', tokenize='trigram'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS customers_fts_insert AFTER INSERT ON customers
+                BEGIN
+                    INSERT INTO customers_fts(rowid, contractor_name, contractor_kana, user_name, address)
+                    VALUES (new.id, new.contractor_name, new.contractor_kana, new.user_name, new.address);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS customers_fts_delete AFTER DELETE ON customers
+                BEGIN
+                    INSERT INTO customers_fts(customers_fts, rowid, contractor_name, contractor_kana, user_name, address)
+                    VALUES ('delete', old.id, old.contractor_name, old.contractor_kana, old.user_name, old.address);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS customers_fts_update AFTER UPDATE ON customers
+                BEGIN
+                    INSERT INTO customers_fts(customers_fts, rowid, contractor_name, contractor_kana, user_name, address)
+                    VALUES ('delete', old.id, old.contractor_name, old.contractor_kana, old.user_name, old.address);
+                    INSERT INTO customers_fts(rowid, contractor_name, contractor_kana, user_name, address)
+                    VALUES (new.id, new.contractor_name, new.contractor_kana, new.user_name, new.address);
+                END;
+
+                CREATE TABLE IF NOT EXISTS drafts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    contractor_name TEXT,
+                    contractor_kana TEXT,
+                    user_name TEXT,
+                    user_kana TEXT,
+                    postal_code TEXT,
+                    address TEXT,
+                    phone TEXT,
+                    email TEXT,
+                    memo TEXT,
+                    lawyer_code TEXT DEFAULT 'XX',
+                    lawyer_name TEXT,
+                    provider_code TEXT DEFAULT 'XX',
+                    provider_name TEXT,
+                    pdf_path TEXT,
+                    confidence REAL DEFAULT 0,
+                    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now'))
+                );
+
                 CREATE TABLE IF NOT EXISTS feedbacks (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     category TEXT NOT NULL,
@@ -325,15 +547,18 @@ class Database:
                     content TEXT NOT NULL,
                     status TEXT DEFAULT 'pending',
                     user_name TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now')),
+                    updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now'))
                 );
 
-                CREATE INDEX IF NOT EXISTS idx_feedbacks_status
-                ON feedbacks(status);
+                -- ステータス別・カテゴリ別一覧の並び順まで索引で満たす
+                DROP INDEX IF EXISTS idx_feedbacks_status;
+                CREATE INDEX IF NOT EXISTS idx_feedbacks_status_pri_time
+                ON feedbacks(status, priority DESC, created_at DESC);
 
-                CREATE INDEX IF NOT EXISTS idx_feedbacks_category
-                ON feedbacks(category);
+                DROP INDEX IF EXISTS idx_feedbacks_category;
+                CREATE INDEX IF NOT EXISTS idx_feedbacks_category_time
+                ON feedbacks(category, created_at DESC);
 
                 CREATE INDEX IF NOT EXISTS idx_feedbacks_priority
                 ON feedbacks(priority);
@@ -349,7 +574,7 @@ class Database:
                     court_case_number TEXT,
                     requester_name TEXT,
                     requester_lawyer TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now')),
                     FOREIGN KEY (document_id) REFERENCES documents(id)
                 );
 
@@ -359,6 +584,9 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_disclosures_court_case
                 ON disclosures(court_case_number);
 
+                CREATE INDEX IF NOT EXISTS idx_disclosures_created
+                ON disclosures(created_at DESC);
+
                 CREATE TABLE IF NOT EXISTS disclosed_subscribers (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     disclosure_id INTEGER NOT NULL,
@@ -372,12 +600,14 @@ class Database:
                     ip_address TEXT,
                     port_number INTEGER,
                     communication_datetime TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now')),
                     FOREIGN KEY (disclosure_id) REFERENCES disclosures(id)
                 );
 
-                CREATE INDEX IF NOT EXISTS idx_disclosed_subscribers_disclosure
-                ON disclosed_subscribers(disclosure_id);
+                -- 開示ごとの契約者一覧を番号順のまま索引から読む
+                DROP INDEX IF EXISTS idx_disclosed_subscribers_disclosure;
+                CREATE INDEX IF NOT EXISTS idx_disclosed_subscribers_disclosure_seq
+                ON disclosed_subscribers(disclosure_id, sequence_number);
 
                 CREATE INDEX IF NOT EXISTS idx_disclosed_subscribers_name
                 ON disclosed_subscribers(subscriber_name);
@@ -385,6 +615,32 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_disclosed_subscribers_ip
                 ON disclosed_subscribers(ip_address);
 
+                -- 契約者検索用の全文検索インデックス
+                CREATE VIRTUAL TABLE IF NOT EXISTS disclosed_subscribers_fts USING fts5(
+                    subscriber_name, subscriber_address, ip_address,
+                    content='disclosed_subscribers', content_rowid='id', tokenize='trigram'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS disclosed_subscribers_fts_insert AFTER INSERT ON disclosed_subscribers
+                BEGIN
+                    INSERT INTO disclosed_subscribers_fts(rowid, subscriber_name, subscriber_address, ip_address)
+                    VALUES (new.id, new.subscriber_name, new.subscriber_address, new.ip_address);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS disclosed_subscribers_fts_delete AFTER DELETE ON disclosed_subscribers
+                BEGIN
+                    INSERT INTO disclosed_subscribers_fts(disclosed_subscribers_fts, rowid, subscriber_name, subscriber_address, ip_address)
+                    VALUES ('delete', old.id, old.subscriber_name, old.subscriber_address, old.ip_address);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS disclosed_subscribers_fts_update AFTER UPDATE ON disclosed_subscribers
+                BEGIN
+                    INSERT INTO disclosed_subscribers_fts(disclosed_subscribers_fts, rowid, subscriber_name, subscriber_address, ip_address)
+                    VALUES ('delete', old.id, old.subscriber_name, old.subscriber_address, old.ip_address);
+                    INSERT INTO disclosed_subscribers_fts(rowid, subscriber_name, subscriber_address, ip_address)
+                    VALUES (new.id, new.subscriber_name, new.subscriber_address, new.ip_address);
+                END;
+
                 -- ==================== 受任通知 ====================
 
                 CREATE TABLE IF NOT EXISTS acceptance_notices (
@@ -425,27 +681,180 @@ class Database:
                     work_title TEXT,
                     work_hash TEXT,
 
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now')),
                     FOREIGN KEY (document_id) REFERENCES documents(id)
                 );
 
                 CREATE INDEX IF NOT EXISTS idx_acceptance_notices_court_case
                 ON acceptance_notices(court_case_number);
 
+                CREATE INDEX IF NOT EXISTS idx_acceptance_notices_created
+                ON acceptance_notices(created_at DESC);
+
                 CREATE INDEX IF NOT EXISTS idx_acceptance_notices_subscriber
                 ON acceptance_notices(subscriber_name);
 
                 CREATE INDEX IF NOT EXISTS idx_acceptance_notices_user
                 ON acceptance_notices(user_name);
 
-                CREATE INDEX IF NOT EXISTS idx_acceptance_notices_plaintiff
-                ON acceptance_notices(plaintiff_name);
+                -- LIKEは英字の大文字小文字を区別しないため、前方一致で使えるようNOCASEで索引を張る
+                DROP INDEX IF EXISTS idx_acceptance_notices_plaintiff;
+                CREATE INDEX IF NOT EXISTS idx_acceptance_notices_plaintiff_nocase
+                ON acceptance_notices(plaintiff_name COLLATE NOCASE);
+
+                -- 統計の上位集計（空欄を除く）を索引だけで行うための部分インデックス
+                CREATE INDEX IF NOT EXISTS idx_acceptance_notices_plaintiff_nn
+                ON acceptance_notices(plaintiff_name)
+                WHERE plaintiff_name IS NOT NULL AND plaintiff_name != '';
+
+                CREATE INDEX IF NOT EXISTS idx_acceptance_notices_lawyer_firm_nn
+                ON acceptance_notices(lawyer_firm)
+                WHERE lawyer_firm IS NOT NULL AND lawyer_firm != '';
+
+                -- 受任通知検索用の全文検索インデックス
+                CREATE VIRTUAL TABLE IF NOT EXISTS acceptance_notices_fts USING fts5(
+                    subscriber_name, user_name, court_case_number, plaintiff_name,
+                    content='acceptance_notices', content_rowid='id', tokenize='trigram'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS acceptance_notices_fts_insert AFTER INSERT ON acceptance_notices
+                BEGIN
+                    INSERT INTO acceptance_notices_fts(rowid, subscriber_name, user_name, court_case_number, plaintiff_name)
+                    VALUES (new.id, new.subscriber_name, new.user_name, new.court_case_number, new.plaintiff_name);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS acceptance_notices_fts_delete AFTER DELETE ON acceptance_notices
+                BEGIN
+                    INSERT INTO acceptance_notices_fts(acceptance_notices_fts, rowid, subscriber_name, user_name, court_case_number, plaintiff_name)
+                    VALUES ('delete', old.id, old.subscriber_name, old.user_name, old.court_case_number, old.plaintiff_name);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS acceptance_notices_fts_update AFTER UPDATE ON acceptance_notices
+                BEGIN
+                    INSERT INTO acceptance_notices_fts(acceptance_notices_fts, rowid, subscriber_name, user_name, court_case_number, plaintiff_name)
+                    VALUES ('delete', old.id, old.subscriber_name, old.user_name, old.court_case_number, old.plaintiff_name);
+                    INSERT INTO acceptance_notices_fts(rowid, subscriber_name, user_name, court_case_number, plaintiff_name)
+                    VALUES (new.id, new.subscriber_name, new.user_name, new.court_case_number, new.plaintiff_name);
+                END;
             """
             )
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """データベース接続を取得"""
-        return sqlite3.connect(self.db_path)
+            # 既存DBに検索インデックスを追加した場合は既存行から構築
+            for fts_table in (
+                "customers_fts", "documents_fts", "disclosed_subscribers_fts", "acceptance_notices_fts"
+            ):
+                if fts_table not in existing:
+                    conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+            # 件数トリガーを追加した場合は既存の文書から件数を合わせる
+            if "documents_cluster_count_insert" not in existing:
+                self.update_all_cluster_counts()
+
+            # 旧形式（空白区切り）で保存された日時をT区切りに揃える（一度だけ実行）
+            # 混在すると同じ日の行が文字列比較・ORDER BY で正しく並ばない
+            if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+                for table, column in self._TIMESTAMP_COLUMNS:
+                    conn.execute(
+                        f"UPDATE {table} SET {column} = replace({column}, ' ', 'T') "
+                        f"WHERE {column} LIKE '____-__-__ %'"
+                    )
+                conn.execute("PRAGMA user_version = 1")
+
+            conn.execute(self._PURGE_STALE_DRAFTS_SQL)
+
+    @contextmanager
+    def _get_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        共有のデータベース接続を排他的に取得
+
+        ブロックを正常に抜けるとコミット、例外時はロールバックする
+        write_txn の中から呼ばれた場合は外側のトランザクションに含め、ここではコミットしない
+        """
+        with self._lock:
+            if self._in_write_txn:
+                yield self._conn
+                return
+            try:
+                with self._conn:
+                    yield self._conn
+            finally:
+                self._write_gen += 1  # コミット後に進める
+
+    @contextmanager
+    def write_txn(self) -> Iterator[sqlite3.Connection]:
+        """
+        複数の書き込みを1つのトランザクションで行う
+
+        開始時に BEGIN IMMEDIATE で書き込みロックを取るため、別プロセスの書き込みと
+        競合してもトランザクションの途中で失敗しない
+        ブロック内で呼んだ insert_* などの書き込みメソッドも同じトランザクションに含まれる
+
+        例:
+            with db.write_txn():
+                disclosure_id = db.insert_disclosure(document_number="SL3502")
+                db.insert_disclosed_subscriber(disclosure_id, subscriber_name="...")
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._in_write_txn = True
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
+            else:
+                self._conn.commit()
+            finally:
+                self._in_write_txn = False
+                self._write_gen += 1
+
+    def _data_generation(self) -> Tuple[int, int]:
+        """
+        DBの内容が変わると変わる値
+
+        このプロセスの書き込み回数と、PRAGMA data_version の組
+        data_version は専用の読み取り接続で取るため、他の接続（このプロセスの書き込み用接続や
+        他プロセス）のコミットで変わり、書き込み中のトランザクションを待たない
+        """
+        with self._version_lock:
+            data_version = self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+        return self._write_gen, data_version
+
+    @contextmanager
+    def _get_read_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        読み取り専用の接続をプールから借りる
+
+        WALにより他スレッドの書き込みと並行して、コミット済みの内容を読める
+        iter_* のジェネレータが接続を借りたまま止まってもデッドロックしないよう、
+        一定時間で借りられなければ一時的な読み取り専用接続を開いて使い、使い終われば閉じる
+        """
+        try:
+            conn = self._read_pool.get(timeout=self._READ_POOL_TIMEOUT)
+        except queue.Empty:
+            conn = self._connect(readonly=True)
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+    # filepathが既存の文書は上書き（IDを維持し、customers.document_id の参照を保つ）
+    _UPSERT_DOCUMENT_SQL = """
+        INSERT INTO documents
+        (filename, filepath, cluster_id, ocr_text, page_count, confidence)
+        VALUES (:filename, :filepath, :cluster_id, :ocr_text, :page_count, :confidence)
+        ON CONFLICT(filepath) DO UPDATE SET
+            filename = excluded.filename,
+            cluster_id = excluded.cluster_id,
+            ocr_text = excluded.ocr_text,
+            page_count = excluded.page_count,
+            confidence = excluded.confidence
+    """
 
     def insert_document(
         self,
@@ -460,103 +869,148 @@ class Database:
         文書を挿入
 
         Returns:
-            挿入されたレコードのID
+            挿入（または更新）されたレコードのID
         """
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                """
-                INSERT OR REPLACE INTO documents
-                (filename, filepath, cluster_id, ocr_text, page_count, confidence)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (filename, filepath, cluster_id, ocr_text, page_count, confidence),
-            )
-            return cursor.lastrowid
+            row = conn.execute(
+                self._UPSERT_DOCUMENT_SQL + " RETURNING id",
+                {
+                    "filename": filename,
+                    "filepath": filepath,
+                    "cluster_id": cluster_id,
+                    "ocr_text": ocr_text,
+                    "page_count": page_count,
+                    "confidence": confidence,
+                },
+            ).fetchone()
+            return row[0]
+
+    # 一括挿入でコミットする単位（途中で失敗しても確定済みのチャンクは残る）
+    _INSERT_CHUNK_SIZE = 1024
 
-    def insert_documents_batch(self, documents: List[dict]) -> int:
+    def insert_documents_batch(self, documents: Iterable[dict], bulk: bool = False) -> int:
         """
         複数文書を一括挿入
 
+        リストを作らずジェネレータで渡せるよう、チャンク単位で読み出してコミットする
+
         Args:
-            documents: [{"filename", "filepath", "cluster_id", "ocr_text", ...}]
+            documents: {"filename", "filepath", "cluster_id", "ocr_text", ...} の反復可能オブジェクト
+            bulk: 大量取込用にコミット時のfsyncを省略するか（中断時は再実行すること）
 
         Returns:
-            挿入された件数
+            挿入（または更新）された件数
         """
+        documents = iter(documents)
+        count = 0
         with self._get_connection() as conn:
-            cursor = conn.executemany(
-                """
-                INSERT OR REPLACE INTO documents
-                (filename, filepath, cluster_id, ocr_text, page_count, confidence)
-                VALUES (:filename, :filepath, :cluster_id, :ocr_text, :page_count, :confidence)
-                """,
-                documents,
-            )
-            return cursor.rowcount
+            # write_txn の中ではコミットは外側でまとめて行い、同期設定も変えられない
+            own_txn = not self._in_write_txn
+            bulk = bulk and own_txn
+            if bulk:
+                conn.execute("PRAGMA synchronous=OFF")
+            try:
+                while chunk := list(islice(documents, self._INSERT_CHUNK_SIZE)):
+                    count += conn.executemany(self._UPSERT_DOCUMENT_SQL, chunk).rowcount
+                    if own_txn:
+                        conn.commit()
+            finally:
+                if bulk:
+                    conn.execute("PRAGMA synchronous=NORMAL")
+            return count
 
     def get_document(self, doc_id: int) -> Optional[Document]:
         """IDで文書を取得"""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM documents WHERE id = ?", (doc_id,)
+                f"SELECT {_DOCUMENT_COLUMNS} FROM documents WHERE id = ?", (doc_id,)
             ).fetchone()
             return Document.from_row(row) if row else None
 
     def get_document_by_filepath(self, filepath: str) -> Optional[Document]:
         """ファイルパスで文書を取得"""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM documents WHERE filepath = ?", (filepath,)
+                f"SELECT {_DOCUMENT_COLUMNS} FROM documents WHERE filepath = ?", (filepath,)
             ).fetchone()
             return Document.from_row(row) if row else None
 
     def get_documents_by_cluster(self, cluster_id: int) -> List[Document]:
         """クラスタIDで文書を取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM documents WHERE cluster_id = ? ORDER BY filename",
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_DOCUMENT_COLUMNS} FROM documents WHERE cluster_id = ? ORDER BY filename",
                 (cluster_id,),
-            ).fetchall()
-            return [Document.from_row(row) for row in rows]
+            )
+            return [Document.from_row(row) for row in cursor]
 
     def get_all_documents(self) -> List[Document]:
         """全文書を取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM documents ORDER BY cluster_id, filename"
-            ).fetchall()
-            return [Document.from_row(row) for row in rows]
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_DOCUMENT_COLUMNS} FROM documents ORDER BY cluster_id, filename"
+            )
+            return [Document.from_row(row) for row in cursor]
+
+    def get_documents_meta_by_cluster(self, cluster_id: int) -> List[DocumentMeta]:
+        """クラスタIDで文書を取得（OCRテキストは読み込まない）"""
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_DOCUMENT_META_COLUMNS} FROM documents WHERE cluster_id = ? ORDER BY filename",
+                (cluster_id,),
+            )
+            return [DocumentMeta.from_row(row) for row in cursor]
+
+    def get_all_documents_meta(self) -> List[DocumentMeta]:
+        """全文書を取得（OCRテキストは読み込まない）"""
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_DOCUMENT_META_COLUMNS} FROM documents ORDER BY cluster_id, filename"
+            )
+            return [DocumentMeta.from_row(row) for row in cursor]
 
     def update_cluster(self, cluster_id: int, name: str = None, description: str = None):
-        """クラスタ情報を更新"""
+        """クラスタ情報を更新（文書数はトリガーで維持されるため変更しない）"""
         with self._get_connection() as conn:
-            # ドキュメント数をカウント
-            count = conn.execute(
-                "SELECT COUNT(*) FROM documents WHERE cluster_id = ?", (cluster_id,)
-            ).fetchone()[0]
-
             conn.execute(
                 """
-                INSERT OR REPLACE INTO clusters (id, name, description, document_count)
-                VALUES (?, ?, ?, ?)
+                INSERT INTO clusters (id, name, description, document_count)
+                VALUES (?, ?, ?, 0)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name,
+                    description = excluded.description
                 """,
-                (cluster_id, name or f"クラスタ {cluster_id}", description, count),
+                (cluster_id, name or f"クラスタ {cluster_id}", description),
             )
 
     def update_all_cluster_counts(self):
-        """全クラスタのドキュメント数を更新"""
-        with self._get_connection() as conn:
-            # クラスタIDを取得
-            cluster_ids = conn.execute(
-                "SELECT DISTINCT cluster_id FROM documents"
-            ).fetchall()
+        """
+        全クラスタのドキュメント数を文書テーブルから再集計
 
-            for (cluster_id,) in cluster_ids:
-                self.update_cluster(cluster_id)
+        通常はトリガーで維持されるため、既存DBの移行時や件数の修復時のみ使用する
+        """
+        with self._get_connection() as conn:
+            conn.execute(
+                """
+                UPDATE clusters SET document_count = 0
+                WHERE id NOT IN (SELECT cluster_id FROM documents)
+                """
+            )
+            # 集計と登録を1文で行う（既存クラスタは件数のみ更新）
+            conn.execute(
+                """
+                INSERT INTO clusters (id, name, document_count)
+                SELECT cluster_id, 'クラスタ ' || cluster_id, COUNT(*)
+                FROM documents
+                WHERE true
+                GROUP BY cluster_id
+                ON CONFLICT(id) DO UPDATE SET document_count = excluded.document_count
+                """
+            )
 
     def get_cluster_stats(self) -> List[dict]:
         """クラスタ統計を取得"""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             rows = conn.execute(
                 """
                 SELECT
@@ -581,18 +1035,29 @@ class Database:
             ]
 
     def search_text(self, query: str, limit: int = 100) -> List[Document]:
-        """テキスト検索"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                """
-                SELECT * FROM documents
-                WHERE ocr_text LIKE ?
+        """
+        テキスト検索
+
+        trigramは3文字未満の語を検索できないため、その場合のみLIKEで走査する
+        """
+        if len(query) >= 3:
+            condition = "id IN (SELECT rowid FROM documents_fts WHERE documents_fts MATCH ?)"
+            param = _fts_phrase(query)
+        else:
+            condition = "ocr_text LIKE ? ESCAPE '\\'"
+            param = _like_contains(query)
+
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"""
+                SELECT {_DOCUMENT_COLUMNS} FROM documents
+                WHERE {condition}
                 ORDER BY created_at DESC
                 LIMIT ?
                 """,
-                (f"%{query}%", limit),
-            ).fetchall()
-            return [Document.from_row(row) for row in rows]
+                (param, limit),
+            )
+            return [Document.from_row(row) for row in cursor]
 
     def delete_document(self, doc_id: int):
         """文書を削除"""
@@ -605,6 +1070,7 @@ class Database:
             conn.execute("DELETE FROM documents")
             conn.execute("DELETE FROM clusters")
             conn.execute("DELETE FROM customers")
+            conn.execute("DELETE FROM drafts")
             conn.execute("DELETE FROM feedbacks")
             conn.execute("DELETE FROM disclosures")
             conn.execute("DELETE FROM disclosed_subscribers")
@@ -680,83 +1146,183 @@ class Database:
             confidence=fields.confidence,
         )
 
+    def insert_customers_from_fields(self, fields_list: list, document_id: int = None) -> int:
+        """
+        複数のExtractedFieldsを1トランザクションで一括挿入
+
+        Args:
+            fields_list: ExtractedFields（同じ属性を持つオブジェクト）のリスト
+            document_id: 関連するdocumentのID
+
+        Returns:
+            挿入された件数
+        """
+        with self._get_connection() as conn:
+            cursor = conn.executemany(
+                """
+                INSERT INTO customers
+                (document_id, contractor_name, contractor_kana, user_name, user_kana,
+                 postal_code, address, phone, email, memo,
+                 lawyer_code, lawyer_name, provider_code, provider_name, confidence)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (document_id, f.contractor_name, f.contractor_kana, f.user_name, f.user_kana,
+                     f.postal_code, f.address, f.phone, f.email, f.memo,
+                     f.lawyer_code, f.lawyer_name, f.provider_code, f.provider_name, f.confidence)
+                    for f in fields_list
+                ],
+            )
+            return cursor.rowcount
+
     def get_customer(self, customer_id: int) -> Optional[Customer]:
         """IDで顧客を取得"""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM customers WHERE id = ?", (customer_id,)
+                f"SELECT {_CUSTOMER_COLUMNS} FROM customers WHERE id = ?", (customer_id,)
             ).fetchone()
             return Customer.from_row(row) if row else None
 
     def get_all_customers(self) -> List[Customer]:
         """全顧客を取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM customers ORDER BY created_at DESC"
-            ).fetchall()
-            return [Customer.from_row(row) for row in rows]
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_CUSTOMER_COLUMNS} FROM customers ORDER BY created_at DESC"
+            )
+            return [Customer.from_row(row) for row in cursor]
+
+    def iter_customers(self, batch_size: int = 1000) -> Iterator[Customer]:
+        """全顧客を順に取得（全件をメモリに載せない）"""
+        # 読み取り用の接続を読み終わるまで借りる（他の読み書きはプールの残りの接続で行える）
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(f"SELECT {_CUSTOMER_COLUMNS} FROM customers ORDER BY created_at DESC")
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield Customer.from_row(row)
 
     def get_customers_by_lawyer(self, lawyer_code: str) -> List[Customer]:
         """弁護士コードで顧客を取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM customers WHERE lawyer_code = ? ORDER BY created_at DESC",
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_CUSTOMER_COLUMNS} FROM customers WHERE lawyer_code = ? ORDER BY created_at DESC",
                 (lawyer_code,),
-            ).fetchall()
-            return [Customer.from_row(row) for row in rows]
+            )
+            return [Customer.from_row(row) for row in cursor]
 
     def get_customers_by_provider(self, provider_code: str) -> List[Customer]:
         """プロバイダコードで顧客を取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM customers WHERE provider_code = ? ORDER BY created_at DESC",
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_CUSTOMER_COLUMNS} FROM customers WHERE provider_code = ? ORDER BY created_at DESC",
                 (provider_code,),
-            ).fetchall()
-            return [Customer.from_row(row) for row in rows]
+            )
+            return [Customer.from_row(row) for row in cursor]
+
+    def _customer_search_condition(self, query: str) -> tuple:
+        """
+        顧客検索（名前・ふりがな・住所）のWHERE条件を生成
+
+        trigramは3文字未満の語を検索できないため、その場合のみLIKEで走査する
+
+        Returns:
+            (WHERE句, パラメータ) のタプル
+        """
+        if len(query) >= 3:
+            phrase = _fts_phrase(query)
+            return (
+                "id IN (SELECT rowid FROM customers_fts WHERE customers_fts MATCH ?)",
+                (phrase,),
+            )
+
+        # 4列を改行区切りで連結し、1回のLIKEで照合する（改行を挟むため列をまたいでは一致しない）
+        return (
+            """ifnull(contractor_name, '') || char(10) || ifnull(contractor_kana, '') || char(10)
+               || ifnull(user_name, '') || char(10) || ifnull(address, '')
+               LIKE ? ESCAPE '\\'""",
+            (_like_contains(query),),
+        )
 
     def search_customers(self, query: str, limit: int = 100) -> List[Customer]:
         """顧客を検索（名前・住所）"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                """
-                SELECT * FROM customers
-                WHERE contractor_name LIKE ?
-                   OR user_name LIKE ?
-                   OR address LIKE ?
+        condition, params = self._customer_search_condition(query)
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"""
+                SELECT {_CUSTOMER_COLUMNS} FROM customers
+                WHERE {condition}
                 ORDER BY created_at DESC
                 LIMIT ?
                 """,
-                (f"%{query}%", f"%{query}%", f"%{query}%", limit),
-            ).fetchall()
-            return [Customer.from_row(row) for row in rows]
+                (*params, limit),
+            )
+            return [Customer.from_row(row) for row in cursor]
+
+    def history_dataframe(self, query: Optional[str] = None, limit: int = 100) -> pd.DataFrame:
+        """
+        履歴表示用の顧客一覧をDataFrameで取得
+
+        Args:
+            query: 検索クエリ（名前・住所）。Noneで全件
+            limit: 検索時の最大件数
 
+        Returns:
+            表示用に整形済みのDataFrame
+        """
+        sql = """
+            SELECT
+                id AS "ID",
+                contractor_name AS "契約者名",
+                CASE WHEN length(address) > 30
+                     THEN substr(address, 1, 30) || '...'
+                     ELSE address END AS "住所",
+                phone AS "電話番号",
+                lawyer_code AS "弁護士",
+                provider_code AS "プロバイダ",
+                COALESCE(strftime('%Y-%m-%d %H:%M', created_at), '') AS "登録日"
+            FROM customers
+        """
+        params: tuple = ()
+        if query:
+            condition, search_params = self._customer_search_condition(query)
+            sql += f"""
+            WHERE {condition}
+            ORDER BY created_at DESC
+            LIMIT ?
+            """
+            params = (*search_params, limit)
+        else:
+            sql += " ORDER BY created_at DESC"
+
+        with self._get_read_connection() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    @_memoize_until_write
     def get_customer_stats(self) -> dict:
         """顧客統計を取得"""
-        with self._get_connection() as conn:
-            total = conn.execute("SELECT COUNT(*) FROM customers").fetchone()[0]
-
-            by_lawyer = conn.execute(
+        with self._get_read_connection() as conn:
+            # 弁護士別・プロバイダ別の件数を1回のクエリで取得
+            cursor = conn.execute(
                 """
-                SELECT lawyer_code, COUNT(*) as count
+                SELECT 'lawyer' AS kind, lawyer_code, COUNT(*) AS count
                 FROM customers
                 GROUP BY lawyer_code
-                ORDER BY count DESC
-                """
-            ).fetchall()
-
-            by_provider = conn.execute(
-                """
-                SELECT provider_code, COUNT(*) as count
+                UNION ALL
+                SELECT 'provider', provider_code, COUNT(*)
                 FROM customers
                 GROUP BY provider_code
-                ORDER BY count DESC
+                ORDER BY kind, count DESC
                 """
-            ).fetchall()
+            )
+
+            stats = {"lawyer": {}, "provider": {}}
+            for kind, key, count in cursor:
+                stats[kind][key] = count
 
             return {
-                "total": total,
-                "by_lawyer": {row[0]: row[1] for row in by_lawyer},
-                "by_provider": {row[0]: row[1] for row in by_provider},
+                # 全行がいずれかの弁護士コードに集計されるため合計が総数になる
+                "total": sum(stats["lawyer"].values()),
+                "by_lawyer": stats["lawyer"],
+                "by_provider": stats["provider"],
             }
 
     def delete_customer(self, customer_id: int):
@@ -764,6 +1330,67 @@ class Database:
         with self._get_connection() as conn:
             conn.execute("DELETE FROM customers WHERE id = ?", (customer_id,))
 
+    # ==================== 下書き（保存前の抽出結果） ====================
+
+    # 保存もクリアもされずに残った下書き（セッション切れ等）を削除
+    # created_at は 'YYYY-MM-DDTHH:MM:SS' 形式のため同じ形式で比較する
+    _PURGE_STALE_DRAFTS_SQL = (
+        "DELETE FROM drafts WHERE created_at < strftime('%Y-%m-%dT%H:%M:%S', 'now', '-1 day')"
+    )
+
+    def insert_draft(self, fields) -> int:
+        """
+        ExtractedFieldsを下書きとして挿入
+
+        Args:
+            fields: ExtractedFieldsオブジェクト
+
+        Returns:
+            挿入されたレコードのID
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO drafts
+                (contractor_name, contractor_kana, user_name, user_kana,
+                 postal_code, address, phone, email, memo,
+                 lawyer_code, lawyer_name, provider_code, provider_name,
+                 pdf_path, confidence)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (fields.contractor_name, fields.contractor_kana,
+                 fields.user_name, fields.user_kana,
+                 fields.postal_code, fields.address, fields.phone, fields.email, fields.memo,
+                 fields.lawyer_code, fields.lawyer_name,
+                 fields.provider_code, fields.provider_name,
+                 fields.pdf_path, fields.confidence),
+            )
+            # プロセスが長く動き続けても古い下書きが溜まらないよう、追加のたびに掃除する
+            conn.execute(self._PURGE_STALE_DRAFTS_SQL)
+            return cursor.lastrowid
+
+    def get_drafts(self, draft_ids: List[int]) -> List[Draft]:
+        """IDリストで下書きを取得（ID順）"""
+        if not draft_ids:
+            return []
+        placeholders = ", ".join("?" * len(draft_ids))
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_DRAFT_COLUMNS} FROM drafts WHERE id IN ({placeholders}) ORDER BY id",
+                list(draft_ids),
+            )
+            return [Draft.from_row(row) for row in cursor]
+
+    def delete_drafts(self, draft_ids: List[int]):
+        """下書きを削除"""
+        if not draft_ids:
+            return
+        placeholders = ", ".join("?" * len(draft_ids))
+        with self._get_connection() as conn:
+            conn.execute(
+                f"DELETE FROM drafts WHERE id IN ({placeholders})", list(draft_ids)
+            )
+
     # ==================== フィードバック ====================
 
     def insert_feedback(
@@ -797,29 +1424,29 @@ class Database:
 
     def get_feedback(self, feedback_id: int) -> Optional[Feedback]:
         """IDでフィードバックを取得"""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM feedbacks WHERE id = ?", (feedback_id,)
+                f"SELECT {_FEEDBACK_COLUMNS} FROM feedbacks WHERE id = ?", (feedback_id,)
             ).fetchone()
             return Feedback.from_row(row) if row else None
 
     def get_all_feedbacks(self, limit: int = 100) -> List[Feedback]:
         """全フィードバックを取得（新しい順）"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM feedbacks ORDER BY created_at DESC LIMIT ?",
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_FEEDBACK_COLUMNS} FROM feedbacks ORDER BY created_at DESC LIMIT ?",
                 (limit,),
-            ).fetchall()
-            return [Feedback.from_row(row) for row in rows]
+            )
+            return [Feedback.from_row(row) for row in cursor]
 
     def get_feedbacks_by_status(self, status: str) -> List[Feedback]:
         """ステータスでフィードバックを取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM feedbacks WHERE status = ? ORDER BY priority DESC, created_at DESC",
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_FEEDBACK_COLUMNS} FROM feedbacks WHERE status = ? ORDER BY priority DESC, created_at DESC",
                 (status,),
-            ).fetchall()
-            return [Feedback.from_row(row) for row in rows]
+            )
+            return [Feedback.from_row(row) for row in cursor]
 
     def get_pending_feedbacks(self) -> List[Feedback]:
         """未対応のフィードバックを取得"""
@@ -827,12 +1454,12 @@ class Database:
 
     def get_feedbacks_by_category(self, category: str) -> List[Feedback]:
         """カテゴリでフィードバックを取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM feedbacks WHERE category = ? ORDER BY created_at DESC",
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_FEEDBACK_COLUMNS} FROM feedbacks WHERE category = ? ORDER BY created_at DESC",
                 (category,),
-            ).fetchall()
-            return [Feedback.from_row(row) for row in rows]
+            )
+            return [Feedback.from_row(row) for row in cursor]
 
     def update_feedback_status(self, feedback_id: int, status: str):
         """フィードバックのステータスを更新"""
@@ -840,47 +1467,44 @@ class Database:
             conn.execute(
                 """
                 UPDATE feedbacks
-                SET status = ?, updated_at = CURRENT_TIMESTAMP
+                SET status = ?, updated_at = strftime('%Y-%m-%dT%H:%M:%S', 'now')
                 WHERE id = ?
                 """,
                 (status, feedback_id),
             )
 
+    @_memoize_until_write
     def get_feedback_stats(self) -> dict:
         """フィードバック統計を取得"""
-        with self._get_connection() as conn:
-            total = conn.execute("SELECT COUNT(*) FROM feedbacks").fetchone()[0]
-
-            by_status = conn.execute(
+        with self._get_read_connection() as conn:
+            # ステータス別・カテゴリ別・優先度別の件数を1回のクエリで取得
+            cursor = conn.execute(
                 """
-                SELECT status, COUNT(*) as count
+                SELECT 'status' AS kind, status, COUNT(*) AS count
                 FROM feedbacks
                 GROUP BY status
-                """
-            ).fetchall()
-
-            by_category = conn.execute(
-                """
-                SELECT category, COUNT(*) as count
+                UNION ALL
+                SELECT 'category', category, COUNT(*)
                 FROM feedbacks
                 GROUP BY category
-                ORDER BY count DESC
-                """
-            ).fetchall()
-
-            by_priority = conn.execute(
-                """
-                SELECT priority, COUNT(*) as count
+                UNION ALL
+                SELECT 'priority', priority, COUNT(*)
                 FROM feedbacks
                 GROUP BY priority
+                ORDER BY kind, count DESC
                 """
-            ).fetchall()
+            )
+
+            stats = {"status": {}, "category": {}, "priority": {}}
+            for kind, key, count in cursor:
+                stats[kind][key] = count
 
             return {
-                "total": total,
-                "by_status": {row[0]: row[1] for row in by_status},
-                "by_category": {row[0]: row[1] for row in by_category},
-                "by_priority": {row[0]: row[1] for row in by_priority},
+                # 全行がいずれかのステータスに集計されるため合計が総数になる
+                "total": sum(stats["status"].values()),
+                "by_status": stats["status"],
+                "by_category": stats["category"],
+                "by_priority": stats["priority"],
             }
 
     def delete_feedback(self, feedback_id: int):
@@ -890,6 +1514,39 @@ class Database:
 
     # ==================== プロバイダ開示 ====================
 
+    # 一括取込中に二次索引を外すテーブル
+    _BULK_INGEST_TABLES = ("disclosures", "disclosed_subscribers", "acceptance_notices")
+
+    @contextmanager
+    def bulk_ingest_mode(self) -> Iterator["Database"]:
+        """
+        開示・受任通知の一括取込中は索引の更新を後回しにする
+
+        ブロックに入るときに二次索引を外し、抜けるときにまとめて作り直してANALYZEする
+        ブロックの間は他スレッドの書き込みを待たせる
+        （途中で異常終了しても、次回起動時に_init_dbが索引を作り直す）
+        """
+        placeholders = ", ".join("?" * len(self._BULK_INGEST_TABLES))
+        with self._lock:
+            with self._get_connection() as conn:
+                indexes = conn.execute(
+                    f"""
+                    SELECT name, sql FROM sqlite_master
+                    WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+                    """,
+                    self._BULK_INGEST_TABLES,
+                ).fetchall()
+                for name, _ in indexes:
+                    conn.execute(f"DROP INDEX {name}")
+            try:
+                yield self
+            finally:
+                with self._get_connection() as conn:
+                    for _, sql in indexes:
+                        conn.execute(sql)
+                    for table in self._BULK_INGEST_TABLES:
+                        conn.execute(f"ANALYZE {table}")
+
     def insert_disclosure(
         self,
         document_number: str = "",
@@ -907,17 +1564,44 @@ class Database:
             挿入されたレコードのID
         """
         with self._get_connection() as conn:
-            cursor = conn.execute(
+            row = conn.execute(
                 """
                 INSERT INTO disclosures
                 (document_id, document_number, provider_name, disclosure_date,
                  court_case_number, requester_name, requester_lawyer)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
                 """,
                 (document_id, document_number, provider_name, disclosure_date,
                  court_case_number, requester_name, requester_lawyer),
-            )
-            return cursor.lastrowid
+            ).fetchone()
+            return row[0]
+
+    _INSERT_DISCLOSED_SUBSCRIBER_SQL = """
+        INSERT INTO disclosed_subscribers
+        (disclosure_id, sequence_number, catalog_number,
+         subscriber_name, subscriber_address, subscriber_postal_code,
+         subscriber_phone, subscriber_email,
+         ip_address, port_number, communication_datetime)
+        VALUES (:disclosure_id, :sequence_number, :catalog_number,
+                :subscriber_name, :subscriber_address, :subscriber_postal_code,
+                :subscriber_phone, :subscriber_email,
+                :ip_address, :port_number, :communication_datetime)
+    """
+
+    # 一括挿入で省略された項目の既定値（insert_disclosed_subscriber の引数と同じ）
+    _DISCLOSED_SUBSCRIBER_DEFAULTS = {
+        "sequence_number": 0,
+        "catalog_number": 0,
+        "subscriber_name": "",
+        "subscriber_address": "",
+        "subscriber_postal_code": "",
+        "subscriber_phone": "",
+        "subscriber_email": "",
+        "ip_address": "",
+        "port_number": 0,
+        "communication_datetime": "",
+    }
 
     def insert_disclosed_subscriber(
         self,
@@ -940,62 +1624,153 @@ class Database:
             挿入されたレコードのID
         """
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO disclosed_subscribers
-                (disclosure_id, sequence_number, catalog_number,
-                 subscriber_name, subscriber_address, subscriber_postal_code,
-                 subscriber_phone, subscriber_email,
-                 ip_address, port_number, communication_datetime)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (disclosure_id, sequence_number, catalog_number,
-                 subscriber_name, subscriber_address, subscriber_postal_code,
-                 subscriber_phone, subscriber_email,
-                 ip_address, port_number, communication_datetime),
-            )
-            return cursor.lastrowid
+            row = conn.execute(
+                self._INSERT_DISCLOSED_SUBSCRIBER_SQL + " RETURNING id",
+                {
+                    "disclosure_id": disclosure_id,
+                    "sequence_number": sequence_number,
+                    "catalog_number": catalog_number,
+                    "subscriber_name": subscriber_name,
+                    "subscriber_address": subscriber_address,
+                    "subscriber_postal_code": subscriber_postal_code,
+                    "subscriber_phone": subscriber_phone,
+                    "subscriber_email": subscriber_email,
+                    "ip_address": ip_address,
+                    "port_number": port_number,
+                    "communication_datetime": communication_datetime,
+                },
+            ).fetchone()
+            return row[0]
+
+    def insert_disclosed_subscribers_bulk(self, disclosure_id: int, rows: Iterable[dict]) -> List[int]:
+        """
+        1件の開示に含まれる契約者情報をまとめて挿入
+
+        1トランザクション・1回の文準備で全行を挿入する
+
+        Args:
+            disclosure_id: 開示ID
+            rows: insert_disclosed_subscriber のキーワード引数と同名のキーを持つ辞書
+                 （省略したキーは既定値）
+
+        Returns:
+            挿入されたレコードのIDリスト（rowsの順）
+        """
+        params = (
+            {**self._DISCLOSED_SUBSCRIBER_DEFAULTS, **row, "disclosure_id": disclosure_id}
+            for row in rows
+        )
+        with self._get_connection() as conn:
+            # executemany は RETURNING の結果を返さないため、最後のIDから逆算する
+            # （書き込みは直列化されており、1回の executemany で振られるIDは連番になる）
+            count = conn.executemany(self._INSERT_DISCLOSED_SUBSCRIBER_SQL, params).rowcount
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            return list(range(last_id - count + 1, last_id + 1))
 
     def get_disclosure(self, disclosure_id: int) -> Optional[Disclosure]:
         """IDでプロバイダ開示を取得"""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM disclosures WHERE id = ?", (disclosure_id,)
+                f"SELECT {_DISCLOSURE_COLUMNS} FROM disclosures WHERE id = ?", (disclosure_id,)
             ).fetchone()
             return Disclosure.from_row(row) if row else None
 
     def get_all_disclosures(self) -> List[Disclosure]:
         """全プロバイダ開示を取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM disclosures ORDER BY created_at DESC"
-            ).fetchall()
-            return [Disclosure.from_row(row) for row in rows]
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_DISCLOSURE_COLUMNS} FROM disclosures ORDER BY created_at DESC"
+            )
+            return [Disclosure.from_row(row) for row in cursor]
+
+    def iter_disclosures(self, batch_size: int = 1000) -> Iterator[Disclosure]:
+        """全プロバイダ開示を順に取得（全件をメモリに載せない）"""
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(f"SELECT {_DISCLOSURE_COLUMNS} FROM disclosures ORDER BY created_at DESC")
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield Disclosure.from_row(row)
 
     def get_disclosed_subscribers(self, disclosure_id: int) -> List[DisclosedSubscriber]:
         """開示IDで契約者リストを取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM disclosed_subscribers WHERE disclosure_id = ? ORDER BY sequence_number",
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_DISCLOSED_SUBSCRIBER_COLUMNS} FROM disclosed_subscribers WHERE disclosure_id = ? ORDER BY sequence_number",
                 (disclosure_id,),
-            ).fetchall()
-            return [DisclosedSubscriber.from_row(row) for row in rows]
+            )
+            return [DisclosedSubscriber.from_row(row) for row in cursor]
+
+    # 開示と契約者を1回のJOINで取得する（開示ごとに契約者を取得するN+1を避ける）
+    _DISCLOSURE_WITH_SUBSCRIBERS_SQL = f"""
+        SELECT {_columns_of(Disclosure, "d")}, {_columns_of(DisclosedSubscriber, "s")}
+        FROM disclosures d
+        LEFT JOIN disclosed_subscribers s ON s.disclosure_id = d.id
+    """
+
+    @staticmethod
+    def _group_disclosure_rows(rows) -> List[Tuple[Disclosure, List[DisclosedSubscriber]]]:
+        """JOIN結果を開示ごとにまとめる（行は開示単位で連続していること）"""
+        n = len(fields(Disclosure))
+        results = []
+        for _, group in groupby(rows, key=lambda row: row[0]):
+            group = list(group)
+            subscribers = [
+                DisclosedSubscriber.from_row(row[n:])
+                for row in group
+                if row[n] is not None  # 契約者のない開示はLEFT JOINでNULL行になる
+            ]
+            results.append((Disclosure.from_row(group[0][:n]), subscribers))
+        return results
+
+    def get_disclosure_with_subscribers(
+        self, disclosure_id: int
+    ) -> Optional[Tuple[Disclosure, List[DisclosedSubscriber]]]:
+        """IDでプロバイダ開示と契約者リストを取得"""
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                self._DISCLOSURE_WITH_SUBSCRIBERS_SQL
+                + " WHERE d.id = ? ORDER BY s.sequence_number",
+                (disclosure_id,),
+            )
+            results = self._group_disclosure_rows(cursor)
+            return results[0] if results else None
+
+    def get_all_disclosures_with_subscribers(self) -> List[Tuple[Disclosure, List[DisclosedSubscriber]]]:
+        """全プロバイダ開示を契約者リストとともに取得"""
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                self._DISCLOSURE_WITH_SUBSCRIBERS_SQL
+                + " ORDER BY d.created_at DESC, d.id, s.sequence_number"
+            )
+            return self._group_disclosure_rows(cursor)
 
     def search_disclosed_subscribers(self, query: str, limit: int = 100) -> List[DisclosedSubscriber]:
-        """契約者を検索（名前・住所・IP）"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                """
-                SELECT * FROM disclosed_subscribers
-                WHERE subscriber_name LIKE ?
-                   OR subscriber_address LIKE ?
-                   OR ip_address LIKE ?
+        """
+        契約者を検索（名前・住所・IP）
+
+        trigramは3文字未満の語を検索できないため、その場合のみLIKEで走査する
+        """
+        if len(query) >= 3:
+            condition = "id IN (SELECT rowid FROM disclosed_subscribers_fts WHERE disclosed_subscribers_fts MATCH ?)"
+            params = (_fts_phrase(query),)
+        else:
+            # 3列を改行区切りで連結し、1回のLIKEで照合する（列をまたいでは一致しない）
+            condition = """ifnull(subscriber_name, '') || char(10) || ifnull(subscriber_address, '')
+                   || char(10) || ifnull(ip_address, '')
+                   LIKE ? ESCAPE '\\'"""
+            params = (_like_contains(query),)
+
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"""
+                SELECT {_DISCLOSED_SUBSCRIBER_COLUMNS} FROM disclosed_subscribers
+                WHERE {condition}
                 ORDER BY created_at DESC
                 LIMIT ?
                 """,
-                (f"%{query}%", f"%{query}%", f"%{query}%", limit),
-            ).fetchall()
-            return [DisclosedSubscriber.from_row(row) for row in rows]
+                (*params, limit),
+            )
+            return [DisclosedSubscriber.from_row(row) for row in cursor]
 
     # ==================== 受任通知 ====================
 
@@ -1049,7 +1824,7 @@ class Database:
                 (document_id, notice_date, court_case_number,
                  subscriber_name, subscriber_address, subscriber_postal_code,
                  user_name, user_address, user_postal_code, user_phone, user_email,
-                 1 if is_same_as_subscriber else 0,
+                 is_same_as_subscriber,  # boolはsqlite3が0/1で保存する
                  plaintiff_name, plaintiff_lawyer_firm, plaintiff_lawyer_name,
                  lawyer_firm, lawyer_name, lawyer_address, lawyer_phone, lawyer_fax, lawyer_email,
                  infringement_ip, infringement_datetime, work_title, work_hash),
@@ -1058,55 +1833,91 @@ class Database:
 
     def get_acceptance_notice(self, notice_id: int) -> Optional[AcceptanceNotice]:
         """IDで受任通知を取得"""
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM acceptance_notices WHERE id = ?", (notice_id,)
+                f"SELECT {_ACCEPTANCE_NOTICE_COLUMNS} FROM acceptance_notices WHERE id = ?", (notice_id,)
             ).fetchone()
             return AcceptanceNotice.from_row(row) if row else None
 
     def get_all_acceptance_notices(self) -> List[AcceptanceNotice]:
         """全受任通知を取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM acceptance_notices ORDER BY created_at DESC"
-            ).fetchall()
-            return [AcceptanceNotice.from_row(row) for row in rows]
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_ACCEPTANCE_NOTICE_COLUMNS} FROM acceptance_notices ORDER BY created_at DESC"
+            )
+            return [AcceptanceNotice.from_row(row) for row in cursor]
+
+    def get_all_acceptance_notices_meta(self) -> List[AcceptanceNoticeMeta]:
+        """全受任通知を一覧表示用の項目のみで取得"""
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_ACCEPTANCE_NOTICE_META_COLUMNS} FROM acceptance_notices ORDER BY created_at DESC"
+            )
+            return [AcceptanceNoticeMeta.from_row(row) for row in cursor]
+
+    def iter_acceptance_notices(self, batch_size: int = 500) -> Iterator[AcceptanceNotice]:
+        """全受任通知を順に取得（全件をメモリに載せない）"""
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_ACCEPTANCE_NOTICE_COLUMNS} FROM acceptance_notices ORDER BY created_at DESC"
+            )
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield AcceptanceNotice.from_row(row)
 
     def get_acceptance_notices_by_plaintiff(self, plaintiff_name: str) -> List[AcceptanceNotice]:
-        """著作権者名で受任通知を取得"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM acceptance_notices WHERE plaintiff_name LIKE ? ORDER BY created_at DESC",
-                (f"%{plaintiff_name}%",),
-            ).fetchall()
-            return [AcceptanceNotice.from_row(row) for row in rows]
+        """
+        著作権者名（前方一致）で受任通知を取得
+
+        前方一致のLIKEは idx_acceptance_notices_plaintiff_nocase の範囲検索になる
+        名前の途中で一致させる場合は search_acceptance_notices を使う
+        """
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_ACCEPTANCE_NOTICE_COLUMNS} FROM acceptance_notices WHERE plaintiff_name LIKE ? ESCAPE '\\' ORDER BY created_at DESC",
+                (_like_prefix(plaintiff_name),),
+            )
+            return [AcceptanceNotice.from_row(row) for row in cursor]
 
     def search_acceptance_notices(self, query: str, limit: int = 100) -> List[AcceptanceNotice]:
-        """受任通知を検索（名前・事件番号）"""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                """
-                SELECT * FROM acceptance_notices
-                WHERE subscriber_name LIKE ?
-                   OR user_name LIKE ?
-                   OR court_case_number LIKE ?
-                   OR plaintiff_name LIKE ?
+        """
+        受任通知を検索（名前・事件番号）
+
+        trigramは3文字未満の語を検索できないため、その場合のみLIKEで走査する
+        """
+        if len(query) >= 3:
+            condition = "id IN (SELECT rowid FROM acceptance_notices_fts WHERE acceptance_notices_fts MATCH ?)"
+            params = (_fts_phrase(query),)
+        else:
+            # 4列を改行区切りで連結し、1回のLIKEで照合する（列をまたいでは一致しない）
+            condition = """ifnull(subscriber_name, '') || char(10) || ifnull(user_name, '')
+                   || char(10) || ifnull(court_case_number, '') || char(10) || ifnull(plaintiff_name, '')
+                   LIKE ? ESCAPE '\\'"""
+            params = (_like_contains(query),)
+
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(
+                f"""
+                SELECT {_ACCEPTANCE_NOTICE_COLUMNS} FROM acceptance_notices
+                WHERE {condition}
                 ORDER BY created_at DESC
                 LIMIT ?
                 """,
-                (f"%{query}%", f"%{query}%", f"%{query}%", f"%{query}%", limit),
-            ).fetchall()
-            return [AcceptanceNotice.from_row(row) for row in rows]
+                (*params, limit),
+            )
+            return [AcceptanceNotice.from_row(row) for row in cursor]
 
+    @_memoize_until_write
     def get_acceptance_notice_stats(self) -> dict:
         """受任通知の統計を取得"""
-        with self._get_connection() as conn:
-            total = conn.execute("SELECT COUNT(*) FROM acceptance_notices").fetchone()[0]
-
-            # 契約者と利用者が異なるケース
-            different_user = conn.execute(
-                "SELECT COUNT(*) FROM acceptance_notices WHERE is_same_as_subscriber = 0"
-            ).fetchone()[0]
+        with self._get_read_connection() as conn:
+            # 総数と、契約者と利用者が異なるケースの件数を1回の走査で取得
+            total, different_user = conn.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(is_same_as_subscriber = 0), 0)
+                FROM acceptance_notices
+                """
+            ).fetchone()
 
             by_plaintiff = conn.execute(
                 """
@@ -1133,6 +1944,6 @@ class Database:
             return {
                 "total": total,
                 "different_user_count": different_user,
-                "by_plaintiff": {row[0]: row[1] for row in by_plaintiff},
-                "by_lawyer_firm": {row[0]: row[1] for row in by_lawyer_firm},
+                "by_plaintiff": dict(by_plaintiff),
+                "by_lawyer_firm": dict(by_lawyer_firm),
             }
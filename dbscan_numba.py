@@ -0,0 +1,67 @@
+"""距離行列を入力とするDBSCAN（Numba JIT版）"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def _core_mask(distances, eps, min_samples):
+    """近傍数（自身を含む）が min_samples 以上の点をコア点とする"""
+    n = distances.shape[0]
+    is_core = np.zeros(n, dtype=np.bool_)
+    for i in prange(n):
+        count = 0
+        for j in range(n):
+            if distances[i, j] <= eps:
+                count += 1
+        is_core[i] = count >= min_samples
+    return is_core
+
+
+@njit(cache=True)
+def _expand_clusters(distances, eps, is_core):
+    """コア点から到達可能な点をスタックで辿ってラベル付け"""
+    n = distances.shape[0]
+    labels = np.full(n, -1, dtype=np.int64)
+    stack = np.empty(n, dtype=np.int64)
+    label = 0
+
+    for seed in range(n):
+        if labels[seed] != -1 or not is_core[seed]:
+            continue
+
+        labels[seed] = label
+        stack[0] = seed
+        top = 1
+        while top > 0:
+            top -= 1
+            i = stack[top]
+            if not is_core[i]:
+                continue
+            for j in range(n):
+                if labels[j] == -1 and distances[i, j] <= eps:
+                    labels[j] = label
+                    stack[top] = j
+                    top += 1
+        label += 1
+
+    return labels
+
+
+def dbscan_precomputed(distances: np.ndarray, eps: float, min_samples: int) -> np.ndarray:
+    """
+    距離行列からDBSCANのクラスタラベルを求める
+
+    sklearn の DBSCAN(metric="precomputed") と同じラベルを返す
+
+    Args:
+        distances: 距離行列 (n, n)
+        eps: 近傍とみなす距離の上限
+        min_samples: コア点とみなす近傍数（自身を含む）
+
+    Returns:
+        クラスタラベルの配列（ノイズは -1）
+    """
+    distances = np.ascontiguousarray(distances)
+    is_core = _core_mask(distances, eps, min_samples)
+    return _expand_clusters(distances, eps, is_core)
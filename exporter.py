@@ -1,12 +1,14 @@
 """CSV エクスポートモジュール"""
 
+import csv
+import io
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Union
 
 import pandas as pd
 
 from config import Config
-from database import Database, Document, Customer
+from database import Database, Document, DocumentMeta, Customer
 
 
 class CSVExporter:
@@ -34,7 +36,8 @@ class CSVExporter:
         Returns:
             出力ファイルのパス
         """
-        documents = db.get_all_documents()
+        # テキストを出力しない場合はOCRテキストを読み込まない
+        documents = db.get_all_documents() if include_text else db.get_all_documents_meta()
         return self._export_documents(documents, filename, include_text)
 
     def export_by_cluster(
@@ -56,7 +59,10 @@ class CSVExporter:
         Returns:
             出力ファイルのパス
         """
-        documents = db.get_documents_by_cluster(cluster_id)
+        if include_text:
+            documents = db.get_documents_by_cluster(cluster_id)
+        else:
+            documents = db.get_documents_meta_by_cluster(cluster_id)
         if filename is None:
             filename = f"cluster_{cluster_id}.csv"
         return self._export_documents(documents, filename, include_text)
@@ -101,7 +107,7 @@ class CSVExporter:
 
     def _export_documents(
         self,
-        documents: List[Document],
+        documents: List[Union[Document, DocumentMeta]],
         filename: str,
         include_text: bool = True,
     ) -> Path:
@@ -225,27 +231,7 @@ class CSVExporter:
             pd.DataFrame().to_csv(output_path, index=False, encoding=self.encoding)
             return output_path
 
-        data = []
-        for cust in customers:
-            row = {
-                "ID": cust.id,
-                "契約者名": cust.contractor_name,
-                "ふりがな": cust.contractor_kana,
-                "利用者名": cust.user_name,
-                "利用者ふりがな": cust.user_kana,
-                "郵便番号": cust.postal_code,
-                "住所": cust.address,
-                "電話番号": cust.phone,
-                "メール": cust.email,
-                "メモ": cust.memo,
-                "弁護士コード": cust.lawyer_code,
-                "弁護士事務所": cust.lawyer_name,
-                "プロバイダコード": cust.provider_code,
-                "プロバイダ名": cust.provider_name,
-                "抽出信頼度": round(cust.confidence, 3) if cust.confidence else 0,
-                "登録日時": cust.created_at.isoformat() if cust.created_at else "",
-            }
-            data.append(row)
+        data = [self._customer_row(cust) for cust in customers]
 
         df = pd.DataFrame(data)
         output_path = self.output_dir / filename
@@ -253,6 +239,59 @@ class CSVExporter:
 
         return output_path
 
+    def _customer_row(self, cust: Customer) -> dict:
+        """顧客1件をCSVの1行に変換"""
+        return {
+            "ID": cust.id,
+            "契約者名": cust.contractor_name,
+            "ふりがな": cust.contractor_kana,
+            "利用者名": cust.user_name,
+            "利用者ふりがな": cust.user_kana,
+            "郵便番号": cust.postal_code,
+            "住所": cust.address,
+            "電話番号": cust.phone,
+            "メール": cust.email,
+            "メモ": cust.memo,
+            "弁護士コード": cust.lawyer_code,
+            "弁護士事務所": cust.lawyer_name,
+            "プロバイダコード": cust.provider_code,
+            "プロバイダ名": cust.provider_name,
+            "抽出信頼度": round(cust.confidence, 3) if cust.confidence else 0,
+            "登録日時": cust.created_at.isoformat() if cust.created_at else "",
+        }
+
+    def iter_customers_csv(self, db: Database, batch_size: int = 1000) -> Iterator[bytes]:
+        """
+        全顧客情報をCSVとして逐次生成（ファイルを介さずダウンロード用）
+
+        Args:
+            db: Databaseインスタンス
+            batch_size: 1チャンクあたりの行数
+
+        Yields:
+            エンコード済みのCSVチャンク
+        """
+        buf = io.StringIO()
+        writer = None
+        encoding = self.encoding
+
+        for i, cust in enumerate(db.iter_customers(batch_size), start=1):
+            row = self._customer_row(cust)
+            if writer is None:
+                writer = csv.DictWriter(buf, fieldnames=list(row), lineterminator="\n")
+                writer.writeheader()
+            writer.writerow(row)
+
+            if i % batch_size == 0:
+                yield buf.getvalue().encode(encoding)
+                buf.seek(0)
+                buf.truncate()
+                # BOMは先頭チャンクのみ
+                encoding = "utf-8"
+
+        if buf.tell():
+            yield buf.getvalue().encode(encoding)
+
     def export_customer_stats(
         self,
         db: Database,
@@ -2,7 +2,7 @@
 
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 import cv2
 import numpy as np
@@ -49,6 +49,26 @@ class FeatureExtractor:
         # OCRテキスト抽出
         text = self._extract_text(image_path)
 
+        return self._build_features(image, text, pdf_path or image_path)
+
+    def extract_from_array(self, image: np.ndarray, pdf_path: Path) -> DocumentFeatures:
+        """
+        画像配列から特徴を抽出（画像ファイルを介さない）
+
+        Args:
+            image: BGR形式の画像配列
+            pdf_path: 元のPDFパス（記録用）
+
+        Returns:
+            DocumentFeatures オブジェクト
+        """
+        # TesseractにはRGBで渡す
+        text = self._extract_text(Image.fromarray(image[:, :, ::-1]), label=pdf_path)
+
+        return self._build_features(image, text, pdf_path)
+
+    def _build_features(self, image: np.ndarray, text: str, pdf_path: Path) -> DocumentFeatures:
+        """OCRテキストと画像からレイアウト特徴を求めてまとめる"""
         # テキストブロック検出
         text_blocks = self._detect_text_blocks(image)
 
@@ -56,20 +76,21 @@ class FeatureExtractor:
         layout_features = self._extract_layout_features(image, text_blocks)
 
         return DocumentFeatures(
-            pdf_path=pdf_path or image_path,
+            pdf_path=pdf_path,
             text=text,
             layout_features=layout_features,
             text_blocks=text_blocks,
         )
 
-    def _extract_text(self, image_path: Path) -> str:
-        """Tesseractで簡易OCR"""
+    def _extract_text(self, image: Union[Path, Image.Image], label: Path = None) -> str:
+        """Tesseractで簡易OCR（画像パスまたはPIL画像）"""
         try:
-            image = Image.open(image_path)
+            if not isinstance(image, Image.Image):
+                image = Image.open(image)
             text = pytesseract.image_to_string(image, lang=self.tesseract_lang)
             return text.strip()
         except Exception as e:
-            print(f"OCRエラー [{image_path}]: {e}")
+            print(f"OCRエラー [{label or image}]: {e}")
             return ""
 
     def _detect_text_blocks(self, image: np.ndarray) -> List[dict]:
@@ -78,11 +78,17 @@ JSON形式で出力してください。```json などのマークダウン記
 {ocr_text}
 """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-haiku-20240307"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "claude-3-haiku-20240307",
+        code_master: Optional[CodeMaster] = None,
+    ):
         """
         Args:
             api_key: Anthropic API キー（省略時は環境変数から取得）
             model: 使用するClaudeモデル
+            code_master: 共有するCodeMaster（省略時は新規に読み込む）
         """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
@@ -90,7 +96,7 @@ JSON形式で出力してください。```json などのマークダウン記
 
         self.client = Anthropic(api_key=self.api_key)
         self.model = model
-        self.code_master = CodeMaster()
+        self.code_master = code_master or CodeMaster()
 
     def extract(self, ocr_text: str, pdf_path: Optional[Path] = None) -> ExtractedFields:
         """
@@ -42,6 +42,7 @@ def run_pipeline(
     export_csv: bool = False,
     skip_ocr: bool = False,
     extract_fields: bool = False,
+    accurate_embedding: bool = False,
 ):
     """
     パイプラインを実行
@@ -53,6 +54,7 @@ def run_pipeline(
         export_csv: CSV出力するか
         skip_ocr: 本番OCRをスキップするか（クラスタリングのみ）
         extract_fields: フィールド抽出を行うか（住所・氏名等）
+        accurate_embedding: 高精度（sentence-transformers）の埋め込みを使うか
     """
     # 設定
     if output_dir:
@@ -78,20 +80,21 @@ def run_pipeline(
     # 初期化
     converter = PDFConverter()
     extractor = FeatureExtractor()
-    clusterer = DocumentClusterer()
+    clusterer = DocumentClusterer(
+        embedding_backend="sentence_transformers" if accurate_embedding else None
+    )
     db = Database()
 
     # ステップ1: PDF→画像変換 & 特徴抽出
     print("\n=== ステップ1: PDF変換 & 特徴抽出 ===")
     doc_features: List[DocumentFeatures] = []
 
-    for pdf_path in tqdm(pdf_paths, desc="特徴抽出"):
+    # 1ページ目のみ画像配列化（クラスタリング用、ワーカープロセスで先行して描画）
+    pages_iter = converter.iter_arrays_batch(pdf_paths, last_page=1)
+    for pdf_path, pages in tqdm(pages_iter, total=len(pdf_paths), desc="特徴抽出"):
         try:
-            # 1ページ目のみ画像化（クラスタリング用）
-            image_path = converter.get_first_page_image(pdf_path)
-
             # 特徴抽出
-            features = extractor.extract(image_path, pdf_path)
+            features = extractor.extract_from_array(pages[0], pdf_path)
             doc_features.append(features)
 
         except Exception as e:
@@ -123,11 +126,11 @@ def run_pipeline(
 
             for pdf_path in tqdm(pdf_list, desc=label):
                 try:
-                    # 全ページを画像化
-                    image_paths = converter.convert(pdf_path)
+                    # 全ページを画像化（メモリ上）
+                    images = converter.convert_to_bytes(pdf_path)
 
                     # 本番OCR
-                    ocr_results = ocr_service.ocr_document(image_paths, pdf_path)
+                    ocr_results = ocr_service.ocr_document(images, pdf_path)
                     combined_text = ocr_service.get_combined_text(ocr_results)
 
                     # 平均信頼度
@@ -143,7 +146,7 @@ def run_pipeline(
                         filepath=str(pdf_path.absolute()),
                         cluster_id=cluster_id,
                         ocr_text=combined_text,
-                        page_count=len(image_paths),
+                        page_count=len(images),
                         confidence=avg_confidence,
                     )
 
@@ -156,18 +159,22 @@ def run_pipeline(
         # OCRスキップ時はTesseractの結果を保存
         print("\n=== 本番OCRをスキップ（Tesseract結果を使用） ===")
 
-        for features, result in zip(doc_features, cluster_results):
-            db.insert_document(
-                filename=features.pdf_path.name,
-                filepath=str(features.pdf_path.absolute()),
-                cluster_id=result.cluster_id,
-                ocr_text=features.text,  # Tesseractの結果
-                page_count=1,
-                confidence=0,
-            )
-
-    # クラスタ統計を更新
-    db.update_all_cluster_counts()
+        db.insert_documents_batch(
+            (
+                {
+                    "filename": features.pdf_path.name,
+                    "filepath": str(features.pdf_path.absolute()),
+                    "cluster_id": result.cluster_id,
+                    "ocr_text": features.text,  # Tesseractの結果
+                    "page_count": 1,
+                    "confidence": 0,
+                }
+                for features, result in zip(doc_features, cluster_results)
+            ),
+            bulk=True,
+        )
+
+    # クラスタごとの文書数はDBのトリガーで更新済み
 
     # ステップ3.5: フィールド抽出（オプション）
     if extract_fields and not skip_ocr:
@@ -267,6 +274,11 @@ def main():
         action="store_true",
         help="フィールド抽出を有効化（住所・氏名等をClaude APIで抽出）",
     )
+    parser.add_argument(
+        "--accurate-embedding",
+        action="store_true",
+        help="クラスタリング用の埋め込みを高精度モデル（sentence-transformers、要追加インストール）で計算",
+    )
 
     args = parser.parse_args()
 
@@ -277,6 +289,7 @@ def main():
         export_csv=args.export_csv,
         skip_ocr=args.skip_ocr,
         extract_fields=args.extract_fields,
+        accurate_embedding=args.accurate_embedding,
     )
 
 
@@ -1,7 +1,7 @@
 """Google Cloud Vision OCR モジュール"""
 
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from dataclasses import dataclass
 import time
 
@@ -24,6 +24,13 @@ class OCRResult:
 class GoogleVisionOCR:
     """Google Cloud Vision API を使ったOCR"""
 
+    # 使用するVisionモデル（キャッシュの無効化判定に使用）
+    MODEL_VERSION = "builtin/stable"
+
+    # batch_annotate_images 1リクエストあたりの上限
+    MAX_BATCH_IMAGES = 16
+    MAX_BATCH_BYTES = 8 * 1024 * 1024
+
     def __init__(self):
         self.client = None  # 遅延初期化
 
@@ -64,7 +71,12 @@ class GoogleVisionOCR:
         if response.error.message:
             raise Exception(f"Vision API エラー: {response.error.message}")
 
-        # 結果を解析
+        return self._parse_response(response, pdf_path or image_path, page_number)
+
+    def _parse_response(
+        self, response, pdf_path: Path, page_number: int
+    ) -> OCRResult:
+        """Vision API のレスポンスを OCRResult に変換"""
         full_text = ""
         blocks = []
         confidence_sum = 0
@@ -101,39 +113,104 @@ class GoogleVisionOCR:
         avg_confidence = confidence_sum / confidence_count if confidence_count > 0 else 0
 
         return OCRResult(
-            pdf_path=pdf_path or image_path,
+            pdf_path=pdf_path,
             page_number=page_number,
             text=full_text,
             confidence=avg_confidence,
             blocks=blocks,
         )
 
+    def _split_batches(self, images: List[Union[Path, bytes]]) -> List[List[tuple]]:
+        """
+        画像を1リクエストに収まる単位に分割
+
+        Args:
+            images: 画像ファイルのパス、またはエンコード済み画像データのリスト
+
+        Returns:
+            [[(page_number, image_path, content), ...], ...]（データ渡しの場合 image_path は None）
+        """
+        batches = []
+        current = []
+        current_bytes = 0
+
+        for i, image in enumerate(images):
+            if isinstance(image, bytes):
+                image_path, content = None, image
+            else:
+                image_path = Path(image)
+                with open(image_path, "rb") as f:
+                    content = f.read()
+
+            if current and (
+                len(current) >= self.MAX_BATCH_IMAGES
+                or current_bytes + len(content) > self.MAX_BATCH_BYTES
+            ):
+                batches.append(current)
+                current = []
+                current_bytes = 0
+
+            current.append((i + 1, image_path, content))
+            current_bytes += len(content)
+
+        if current:
+            batches.append(current)
+        return batches
+
     def ocr_document(
-        self, image_paths: List[Path], pdf_path: Path, delay: float = 0.5
+        self, image_paths: List[Union[Path, bytes]], pdf_path: Path, delay: float = 0.5
     ) -> List[OCRResult]:
         """
         複数ページの文書にOCRを実行
 
+        最大16ページずつ batch_annotate_images でまとめて送信する。
+
         Args:
-            image_paths: 画像ファイルのパスリスト（ページ順）
+            image_paths: 画像ファイルのパス、または画像データのリスト（ページ順）
             pdf_path: 元のPDFパス
             delay: API呼び出し間の待機時間（秒）
 
         Returns:
             OCRResult のリスト
         """
-        results = []
-        for i, image_path in enumerate(image_paths):
-            try:
-                result = self.ocr_image(image_path, pdf_path, page_number=i + 1)
-                results.append(result)
+        self._init_client()
+        feature = vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+        image_context = vision.ImageContext(language_hints=["ja"])
 
-                # レート制限対策
-                if delay > 0 and i < len(image_paths) - 1:
-                    time.sleep(delay)
+        results = []
+        batches = self._split_batches(image_paths)
+        for i, batch in enumerate(batches):
+            requests = [
+                vision.AnnotateImageRequest(
+                    image=vision.Image(content=content),
+                    features=[feature],
+                    image_context=image_context,
+                )
+                for _, _, content in batch
+            ]
 
+            try:
+                batch_response = self.client.batch_annotate_images(requests=requests)
             except Exception as e:
-                print(f"OCRエラー [{image_path}]: {e}")
+                print(f"OCRエラー [{pdf_path}]: {e}")
+                continue
+
+            for (page_number, image_path, _), response in zip(
+                batch, batch_response.responses
+            ):
+                if response.error.message:
+                    print(
+                        f"OCRエラー [{image_path or f'{pdf_path} p.{page_number}'}]: "
+                        f"Vision API エラー: {response.error.message}"
+                    )
+                    continue
+                results.append(
+                    self._parse_response(response, pdf_path or image_path, page_number)
+                )
+
+            # レート制限対策
+            if delay > 0 and i < len(batches) - 1:
+                time.sleep(delay)
 
         return results
 